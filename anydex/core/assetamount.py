@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 from typing import Dict
+from weakref import WeakValueDictionary
+
+_asset_amounts = WeakValueDictionary()  # The shared AssetAmount instances that are currently in use
 
 
 class AssetAmount:
     """
     This class represents a specific number of assets. It contains various utility methods to add/substract asset
-    amounts.
+    amounts. Asset amounts are immutable: arithmetic always returns a new instance.
     """
 
+    __slots__ = ('_amount', '_asset_id', '__weakref__')
+
     def __init__(self, amount: int, asset_id: str) -> None:
         """
         :param amount: Integer representation of the asset amount
@@ -23,6 +28,19 @@ class AssetAmount:
         self._amount = amount
         self._asset_id = asset_id
 
+    @classmethod
+    def get(cls, amount: int, asset_id: str) -> AssetAmount:
+        """
+        Return a shared AssetAmount instance for the given amount and asset id, so loading many rows with the same
+        amounts, like the zero amounts of transactions that have not transferred anything yet, does not allocate and
+        validate a new object for each of them.
+        """
+        key = (amount, asset_id)
+        instance = _asset_amounts.get(key)
+        if instance is None:
+            instance = _asset_amounts[key] = cls(amount, asset_id)
+        return instance
+
     @property
     def asset_id(self) -> str:
         return self._asset_id
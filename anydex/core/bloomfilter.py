@@ -22,7 +22,6 @@ Ippolito <bob@redivi.com>.  Simplified, and optimized to use just python code.
 @contact: dispersy@frayja.com
 """
 import logging
-from binascii import hexlify, unhexlify
 from hashlib import md5, sha1, sha256, sha384, sha512
 from math import ceil, log
 from struct import Struct
@@ -83,7 +82,7 @@ class BloomFilter(object):
             prefix = kargs.get("prefix", args[2] if len(args) >= 3 else b"")
             assert 0 < len(bytes_), len(bytes_)
             logger.debug("bloom filter based on %d bytes and k_functions %d", len(bytes_), k_functions)
-            filter_ = int(hexlify(bytes_[::-1]), 16)
+            filter_ = int.from_bytes(bytes_, 'little')
 
         # matches: BloomFilter(int:m_size, float:f_error_rate, str:prefix="")
         elif len(args) >= 2 and isinstance(args[0], int) and isinstance(args[1], float):
@@ -291,7 +290,4 @@ class BloomFilter(object):
         bytes as well as the number of functions are required.
         @rtype: string
         """
-        # hex should be m_size/4, hex is 16 instead of 8 -> hence half the number of "hexes" in m_size
-        hex_ = '%x' % self._filter
-        padding = '0' * (self._m_size // 4 - len(hex_))
-        return unhexlify(padding + hex_)[::-1]
\ No newline at end of file
+        return self._filter.to_bytes(self._m_size // 8, 'little')
\ No newline at end of file
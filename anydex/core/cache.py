@@ -2,7 +2,7 @@ import random
 from asyncio import ensure_future
 
 from ipv8.messaging.payload_headers import GlobalTimeDistributionPayload
-from ipv8.requestcache import NumberCache, RandomNumberCache
+from ipv8.requestcache import NumberCache, RandomNumberCache, RequestCache
 
 from anydex.core import DeclineMatchReason, DeclinedTradeReason
 from anydex.core.defs import MSG_MATCH_DONE
@@ -18,7 +18,7 @@ class MatchCache(NumberCache):
     """
 
     def __init__(self, community, order):
-        super(MatchCache, self).__init__(community.request_cache, "match", int(order.order_id.order_number))
+        super(MatchCache, self).__init__(community.request_cache, "match", order.order_id.order_number.order_number)
         self.community = community
         self.order = order
         self.matches = {}
@@ -34,7 +34,7 @@ class MatchCache(NumberCache):
         return 7200.0
 
     def on_timeout(self):
-        pass
+        self.community.request_cache.unindex_cache(self)
 
     def add_match(self, match_payload):
         """
@@ -101,6 +101,7 @@ class MatchCache(NumberCache):
         Process the first eligible match. First, we sort the list based on price.
         """
         items_processed = 0
+        batch_size = self.community.settings.match_process_batch_size
         while self.order.available_quantity > 0 and not self.queue.is_empty():
             item = self.queue.delete()
             retries, price, other_order_id, other_quantity = item
@@ -120,7 +121,7 @@ class MatchCache(NumberCache):
                                                  other_order_id, price, other_quantity, delay=delay)
             items_processed += 1
 
-            if items_processed == self.community.settings.match_process_batch_size:  # Limit the number of outgoing items when processing
+            if items_processed == batch_size:  # Limit the number of outgoing items when processing
                 break
 
         self._logger.debug("Processed %d items in this batch", items_processed)
@@ -198,13 +199,7 @@ class MatchCache(NumberCache):
         """
         Remove all entries from the queue that match the passed order id.
         """
-        to_remove = []
-        for item in self.queue.queue:
-            if item[2] == order_id:
-                to_remove.append(item)
-
-        for item in to_remove:
-            self.queue.queue.remove(item)
+        self.queue.remove_order(order_id)
 
     def did_trade(self, transaction, block):
         """
@@ -217,15 +212,16 @@ class MatchCache(NumberCache):
 
         self.received_responses_ids.add(other_order_id)
 
+        # The message is the same for every matchmaker, so we only build it once
+        linked_block = self.community.trustchain.persistence.get_linked(block) or block
+        global_time = self.community.claim_global_time()
+        dist = GlobalTimeDistributionPayload(global_time)
+        payload = HalfBlockPairPayload.from_half_blocks(block, linked_block)
+        packet = self.community._ez_pack(self.community._prefix, MSG_MATCH_DONE, [dist, payload], False)
+
         for match_payload in self.matches[other_order_id]:
             self._logger.info("Sending transaction completed (order %s) to matchmaker %s", transaction.order_id,
                               match_payload.matchmaker_trader_id.as_hex())
-
-            linked_block = self.community.trustchain.persistence.get_linked(block) or block
-            global_time = self.community.claim_global_time()
-            dist = GlobalTimeDistributionPayload(global_time)
-            payload = HalfBlockPairPayload.from_half_blocks(block, linked_block)
-            packet = self.community._ez_pack(self.community._prefix, MSG_MATCH_DONE, [dist, payload], False)
             self.community.endpoint.send(self.community.lookup_ip(match_payload.matchmaker_trader_id), packet)
 
         if self.order.status == "open":
@@ -243,6 +239,8 @@ class ProposedTradeRequestCache(NumberCache):
         self.proposed_trade = proposed_trade
 
     def on_timeout(self):
+        self.community.request_cache.unindex_cache(self)
+
         # Just remove the reserved quantity from the order
         order = self.community.order_manager.order_repository.find_by_id(self.proposed_trade.order_id)
         proposed_assets = self.proposed_trade.assets
@@ -251,7 +249,7 @@ class ProposedTradeRequestCache(NumberCache):
         self.community.order_manager.order_repository.update(order)
 
         # Let the match cache know about the timeout
-        cache = self.community.request_cache.get("match", int(order.order_id.order_number))
+        cache = self.community.get_match_cache(order.order_id.order_number)
         if cache:
             cache.received_decline_trade(self.proposed_trade.recipient_order_id, DeclinedTradeReason.OTHER)
 
@@ -301,3 +299,53 @@ class PingRequestCache(RandomNumberCache):
 
     def on_timeout(self):
         self.request_future.set_result(False)
+
+
+class MarketRequestCache(RequestCache):
+    """
+    Request cache that keeps additional indices over the match caches and the proposed trade caches, so the market
+    community can find them without scanning all outstanding requests. The indexed caches remove themselves from the
+    indices when they time out.
+    """
+
+    def __init__(self):
+        super(MarketRequestCache, self).__init__()
+        self.match_caches = {}  # Dict of order number -> MatchCache
+        self.proposed_trade_caches = {}  # Dict of (order id, recipient order id) -> {proposal id: cache}
+
+    def add(self, cache):
+        cache = super(MarketRequestCache, self).add(cache)
+        if cache:
+            self.index_cache(cache)
+        return cache
+
+    def pop(self, prefix, number):
+        cache = super(MarketRequestCache, self).pop(prefix, number)
+        self.unindex_cache(cache)
+        return cache
+
+    def clear(self):
+        self.match_caches.clear()
+        self.proposed_trade_caches.clear()
+        return super(MarketRequestCache, self).clear()
+
+    def index_cache(self, cache):
+        if isinstance(cache, MatchCache):
+            self.match_caches[cache.number] = cache
+        elif isinstance(cache, ProposedTradeRequestCache):
+            key = (cache.proposed_trade.order_id, cache.proposed_trade.recipient_order_id)
+            self.proposed_trade_caches.setdefault(key, {})[cache.number] = cache
+
+    def unindex_cache(self, cache):
+        if isinstance(cache, MatchCache):
+            if self.match_caches.get(cache.number) is cache:
+                del self.match_caches[cache.number]
+        elif isinstance(cache, ProposedTradeRequestCache):
+            key = (cache.proposed_trade.order_id, cache.proposed_trade.recipient_order_id)
+            caches = self.proposed_trade_caches.get(key)
+            if caches is None:
+                return
+            if caches.get(cache.number) is cache:
+                del caches[cache.number]
+            if not caches:
+                del self.proposed_trade_caches[key]
@@ -1,9 +1,13 @@
+import logging
 import os
 import random
+import time
 from asyncio import Future, ensure_future, gather
 from base64 import b64decode
 from binascii import hexlify, unhexlify
+from collections import OrderedDict, deque
 from functools import wraps
+from hashlib import blake2b
 from typing import Dict, List, Optional, Tuple
 
 from ipv8.community import Community, lazy_wrapper
@@ -19,8 +23,8 @@ from anydex.core import DeclineMatchReason, DeclinedTradeReason, MAX_ORDER_TIMEO
 from anydex.core.assetpair import AssetPair
 from anydex.core.block import MarketBlock
 from anydex.core.bloomfilter import BloomFilter
-from anydex.core.cache import MatchCache, OrderStatusRequestCache, PingRequestCache, ProposedTradeRequestCache,\
-    PublicKeyRequestCache
+from anydex.core.cache import MarketRequestCache, MatchCache, OrderStatusRequestCache, PingRequestCache,\
+    ProposedTradeRequestCache, PublicKeyRequestCache
 from anydex.core.clearing_policy import SingleTradeClearingPolicy
 from anydex.core.database import MarketDB
 from anydex.core.defs import *
@@ -47,6 +51,7 @@ from anydex.core.transaction_manager import TransactionManager
 from anydex.core.transaction_repository import DatabaseTransactionRepository,\
     MemoryTransactionRepository
 from anydex.core.wallet_address import WalletAddress
+from anydex.trustchain.block import ValidationResult
 from anydex.trustchain.listener import BlockListener
 from anydex.trustchain.payload import HalfBlockBroadcastPayload, HalfBlockPairBroadcastPayload, HalfBlockPairPayload
 from anydex.wallet.tc_wallet import TrustchainWallet
@@ -68,6 +73,7 @@ class MarketCommunity(Community, BlockListener):
     PROTOCOL_VERSION = 4
     BLOCK_CLASS = MarketBlock
     DB_NAME = 'market'
+    SENT_MATCHES_BLOOM_BITS = 1 << 20  # Size of the bitmap that filters unseen (recipient, tick) match pairs
 
     def __init__(self, *args, **kwargs):
         self.is_matchmaker = kwargs.pop('is_matchmaker', True)
@@ -88,9 +94,15 @@ class MarketCommunity(Community, BlockListener):
 
         self._use_main_thread = True  # Market community is unable to deal with thread pool message processing yet
         self.mid = self.my_peer.mid
+        self._my_trader_id = TraderId(self.mid)
+        self._my_pubkey_bin = self.my_peer.public_key.key_to_bin()
+        # The serialized authentication payload, reused for every outgoing message
+        self._auth_bytes = self.serializer.pack_serializable(BinMemberAuthenticationPayload(self._my_pubkey_bin))
+        self._auth_headers = {}  # The prefix, message id and authentication bytes, by message id
         self.mid_register = {}
         self.pk_register = {}
         self.order_book = None
+        self._tick_insert_methods = {}  # The order book method that inserts a tick, by tick type
         db_path = os.path.join(db_working_dir, self.DB_NAME) if db_working_dir != ":memory:" else db_working_dir
         self.market_database = MarketDB(db_path)
         self.matching_engine = None
@@ -99,9 +111,16 @@ class MarketCommunity(Community, BlockListener):
         self.matching_enabled = True
         self.use_incremental_payments = False
         self.matchmakers = set()
-        self.request_cache = RequestCache()
+        self.matchmaker_mids = set()  # The mids of known matchmakers, to quickly check for known matchmakers
+        self._matchmakers_snapshot = ()  # Tuple copy of the matchmakers to sample broadcast peers from
+        self.request_cache = MarketRequestCache()
         self.cancelled_orders = set()  # Keep track of cancelled orders so we don't add them again to the orderbook.
-        self.sent_matches = set()
+        self.sent_matches = OrderedDict()  # The (recipient order id, tick order id) pairs we sent a match for
+        self._sent_matches_bloom = bytearray(self.SENT_MATCHES_BLOOM_BITS // 8)
+        self._sent_matches_evicted = 0  # How many pairs were evicted from sent_matches since the bitmap was rebuilt
+        self._pending_match_sends = []  # The match payloads waiting to be sent in the next flush
+        self.received_match_done_hashes = set()  # Hashes of recently received transaction-completed messages
+        self.received_match_done_hashes_order = deque()
         self.clearing_policies = []
 
         if self.settings.max_concurrent_trades > 0:
@@ -115,6 +134,8 @@ class MarketCommunity(Community, BlockListener):
             transaction_repository = MemoryTransactionRepository(self.mid)
 
         self.order_manager = OrderManager(order_repository)
+        # Our own orders that might still be matched, so incoming ticks do not require a scan of all our orders
+        self._open_own_orders = {order.order_id for order in order_repository.find_all() if order.is_valid()}
         self.transaction_manager = TransactionManager(transaction_repository)
 
         if self.is_matchmaker:
@@ -256,7 +277,7 @@ class MarketCommunity(Community, BlockListener):
         Return the counter tx, with information on the number of ongoing trades.
         """
         tx = block.transaction.copy()
-        tx["responsibilities"] = len(self.get_responsible_trades(self.my_peer.public_key.key_to_bin(),
+        tx["responsibilities"] = len(self.get_responsible_trades(self._my_pubkey_bin,
                                                                  is_block_initiator=False,
                                                                  counter_sign_block=block))
 
@@ -280,6 +301,7 @@ class MarketCommunity(Community, BlockListener):
             self.order_book.restore_from_database()
         else:
             self.order_book = OrderBook()
+        self._tick_insert_methods = {Ask: self.order_book.insert_ask, Bid: self.order_book.insert_bid}
         self.matching_engine = MatchingEngine(PriceTimeStrategy(self.order_book))
         self.is_matchmaker = True
 
@@ -288,17 +310,31 @@ class MarketCommunity(Community, BlockListener):
         Disable the matchmaker status of this node
         """
         self.order_book = None
+        self._tick_insert_methods = {}
         self.matching_engine = None
         self.is_matchmaker = False
 
+    def _ez_pack_auth(self, msg_num: int, payloads: List, sig: bool = True) -> bytes:
+        """
+        Pack a message of this community that starts with our authentication payload.
+        Equivalent to _ez_pack with our auth payload as first payload, but the message header is only built once.
+        """
+        header = self._auth_headers.get(msg_num)
+        if header is None:
+            header = self._auth_headers[msg_num] = self._prefix + bytes([msg_num]) + self._auth_bytes
+        packet = header + b''.join(payload.to_bytes() for payload in payloads)
+        if sig:
+            packet += self.crypto.create_signature(self.my_peer.key, packet)
+        return packet
+
     def create_introduction_request(self, socket_address: Tuple, extra_bytes: bytes = b'', new_style: bool = False):
-        extra_payload = InfoPayload(TraderId(self.mid), Timestamp.now(), self.is_matchmaker)
+        extra_payload = InfoPayload(self._my_trader_id, Timestamp.now(), self.is_matchmaker)
         extra_bytes = self.serializer.pack_serializable(extra_payload)
         return super(MarketCommunity, self).create_introduction_request(socket_address, extra_bytes)
 
     def create_introduction_response(self, lan_socket_address: Tuple, socket_address: Tuple, identifier: bytes,
                                      introduction=None, extra_bytes: bytes = b'', new_style: bool = False):
-        extra_payload = InfoPayload(TraderId(self.mid), Timestamp.now(), self.is_matchmaker)
+        extra_payload = InfoPayload(self._my_trader_id, Timestamp.now(), self.is_matchmaker)
         extra_bytes = self.serializer.pack_serializable(extra_payload)
         return super(MarketCommunity, self).create_introduction_response(lan_socket_address, socket_address,
                                                                          identifier, introduction, extra_bytes)
@@ -329,10 +365,9 @@ class MarketCommunity(Community, BlockListener):
         """
         self.logger.debug("Sending orderbook sync to peer %s", peer)
         bloomfilter = self.get_orders_bloomfilter()
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = OrderbookSyncPayload(TraderId(self.mid), Timestamp.now(), bloomfilter)
+        payload = OrderbookSyncPayload(self._my_trader_id, Timestamp.now(), bloomfilter)
 
-        packet = self._ez_pack(self._prefix, MSG_BOOK_SYNC, [auth, payload])
+        packet = self._ez_pack_auth(MSG_BOOK_SYNC, [payload])
         self.endpoint.send(peer.address, packet)
 
     def get_orders_bloomfilter(self) -> BloomFilter:
@@ -384,8 +419,9 @@ class MarketCommunity(Community, BlockListener):
         :param order_ids: The order ids to match
         """
         for order_id in order_ids:
-            if self.order_book.tick_exists(order_id):
-                self.match(self.order_book.get_tick(order_id))
+            tick_entry = self.order_book.get_tick(order_id)
+            if tick_entry:
+                self.match(tick_entry)
 
     def match(self, tick: Tick) -> int:
         """
@@ -396,11 +432,11 @@ class MarketCommunity(Community, BlockListener):
         if not self.matching_enabled:
             return 0
 
-        order_tick_entry = self.order_book.get_tick(tick.order_id)
         if tick.assets.first.amount - tick.traded <= 0:
             self.logger.debug("Tick %s does not have any quantity to match!", tick.order_id)
             return 0
 
+        order_tick_entry = self.order_book.get_tick(tick.order_id)
         matched_ticks = self.matching_engine.match(order_tick_entry)
         self.send_match_messages(matched_ticks, tick.order_id)
         return len(matched_ticks)
@@ -421,7 +457,8 @@ class MarketCommunity(Community, BlockListener):
         :param trader_id: The public key of the node
         :param ip: The ip and port of the node
         """
-        self.logger.debug("Updating ip of trader %s to (%s, %s)", trader_id.as_hex(), ip[0], ip[1])
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Updating ip of trader %s to (%s, %s)", trader_id.as_hex(), ip[0], ip[1])
         self.mid_register[trader_id] = ip
 
     def process_tick_block(self, block: MarketBlock) -> None:
@@ -441,24 +478,27 @@ class MarketCommunity(Community, BlockListener):
         Process a TrustChain block containing a transaction initialisation
         :param block: The TrustChain block containing the transaction initialisation
         """
+        if not self.is_matchmaker:
+            # Only matchmakers act on transaction initialisations, so we do not have to validate the block
+            return
+
         if not block.is_valid_tx_init_done_block():
             self._logger.warning("Invalid tx_init block received!")
             return
 
-        if self.is_matchmaker:
-            tx_dict = block.transaction
-            order_id1 = OrderId(TraderId(unhexlify(tx_dict["tx"]["trader_id"])),
-                                OrderNumber(tx_dict["tx"]["order_number"]))
-            order_id2 = OrderId(TraderId(unhexlify(tx_dict["tx"]["partner_trader_id"])),
-                                OrderNumber(tx_dict["tx"]["partner_order_number"]))
-            self.match_order_ids([order_id1, order_id2])
+        tx_dict = block.transaction
+        order_id1 = OrderId(TraderId(unhexlify(tx_dict["tx"]["trader_id"])),
+                            OrderNumber(tx_dict["tx"]["order_number"]))
+        order_id2 = OrderId(TraderId(unhexlify(tx_dict["tx"]["partner_trader_id"])),
+                            OrderNumber(tx_dict["tx"]["partner_order_number"]))
+        self.match_order_ids([order_id1, order_id2])
 
     async def process_tx_payment_block(self, block: MarketBlock) -> None:
         """
         Process a TrustChain block containing a payment.
         :param block: The TrustChain block containing the payment info.
         """
-        if block.link_public_key == self.my_peer.public_key.key_to_bin():
+        if block.link_public_key == self._my_pubkey_bin:
             transaction_id = TransactionId(unhexlify(block.transaction["payment"]["transaction_id"]))
             transaction = self.transaction_manager.find_by_id(transaction_id)
             if not transaction:
@@ -494,7 +534,7 @@ class MarketCommunity(Community, BlockListener):
             self._logger.warning("Invalid tx_done block received!")
             return
 
-        if block.link_public_key == self.my_peer.public_key.key_to_bin():
+        if block.link_public_key == self._my_pubkey_bin:
             # If we have signed an incoming tx_done block, notify the matchmaker about this
             transaction_id = TransactionId(unhexlify(block.transaction["tx"]["transaction_id"]))
             transaction = self.transaction_manager.find_by_id(transaction_id)
@@ -515,13 +555,17 @@ class MarketCommunity(Community, BlockListener):
         Process a TradeChain block containing a order cancellation
         :param block: The TradeChain block containing the order cancellation
         """
+        if not self.is_matchmaker:
+            # Only matchmakers act on cancellations, so we do not have to validate the block
+            return
+
         if not block.is_valid_cancel_block():
             self._logger.warning("Invalid cancel block received!")
             return
 
         order_id = OrderId(TraderId(unhexlify(block.transaction["trader_id"])),
                            OrderNumber(block.transaction["order_number"]))
-        if self.is_matchmaker and self.order_book.tick_exists(order_id):
+        if self.order_book.tick_exists(order_id):
             self.order_book.remove_tick(order_id)
             self.cancelled_orders.add(order_id)
 
@@ -557,10 +601,9 @@ class MarketCommunity(Community, BlockListener):
         """
         Send a ping message with an identifier to a specific peer.
         """
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = PingPongPayload(TraderId(self.mid), Timestamp.now(), identifier)
+        payload = PingPongPayload(self._my_trader_id, Timestamp.now(), identifier)
 
-        packet = self._ez_pack(self._prefix, MSG_PING, [auth, payload])
+        packet = self._ez_pack_auth(MSG_PING, [payload])
         self.endpoint.send(peer.address, packet)
 
     @lazy_wrapper(PingPongPayload)
@@ -571,10 +614,9 @@ class MarketCommunity(Community, BlockListener):
         """
         Send a pong message with an identifier to a specific peer.
         """
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = PingPongPayload(TraderId(self.mid), Timestamp.now(), identifier)
+        payload = PingPongPayload(self._my_trader_id, Timestamp.now(), identifier)
 
-        packet = self._ez_pack(self._prefix, MSG_PONG, [auth, payload])
+        packet = self._ez_pack_auth(MSG_PONG, [payload])
         self.endpoint.send(peer.address, packet)
 
     @lazy_wrapper(PingPongPayload)
@@ -642,6 +684,7 @@ class MarketCommunity(Community, BlockListener):
             # Search for matches
             self.order_book.insert_ask(tick)
             self.match(tick)
+        self._open_own_orders.add(order.order_id)
         return order
 
     async def create_bid(self, assets: AssetPair, timeout: int) -> Order:
@@ -670,6 +713,7 @@ class MarketCommunity(Community, BlockListener):
             # Search for matches
             self.order_book.insert_bid(tick)
             self.match(tick)
+        self._open_own_orders.add(order.order_id)
         return order
 
     def broadcast_block(self, block: MarketBlock) -> List[Peer]:
@@ -682,13 +726,8 @@ class MarketCommunity(Community, BlockListener):
         dist = GlobalTimeDistributionPayload(global_time)
         payload = HalfBlockBroadcastPayload.from_half_block(block, self.settings.ttl)
         packet = self._ez_pack(self.trustchain._prefix, 5, [dist, payload], False)
-        if self.fixed_broadcast_set:
-            broadcast_peers = self.fixed_broadcast_set
-        else:
-            broadcast_peers = random.sample(self.matchmakers, min(len(self.matchmakers), self.settings.fanout))
-
-        for peer in broadcast_peers:
-            self.endpoint.send(peer.address, packet)
+        broadcast_peers = self._select_broadcast_peers()
+        self._broadcast_packet(packet, broadcast_peers)
         self.trustchain.relayed_broadcasts.add(block.block_id)
 
         return broadcast_peers
@@ -704,17 +743,34 @@ class MarketCommunity(Community, BlockListener):
         dist = GlobalTimeDistributionPayload(global_time)
         payload = HalfBlockPairBroadcastPayload.from_half_blocks(block1, block2, self.settings.ttl)
         packet = self._ez_pack(self.trustchain._prefix, 6, [dist, payload], False)
-        if self.fixed_broadcast_set:
-            broadcast_peers = self.fixed_broadcast_set
-        else:
-            broadcast_peers = random.sample(self.matchmakers, min(len(self.matchmakers), self.settings.fanout))
-
-        for peer in broadcast_peers:
-            self.endpoint.send(peer.address, packet)
+        broadcast_peers = self._select_broadcast_peers()
+        self._broadcast_packet(packet, broadcast_peers)
         self.trustchain.relayed_broadcasts.add(block1.block_id)
 
         return broadcast_peers
 
+    def _select_broadcast_peers(self) -> List[Peer]:
+        """
+        Select the peers that should receive a broadcast market message.
+        These are the fixed broadcast peers if set, otherwise a random sample of at most fanout matchmakers.
+        """
+        if self.fixed_broadcast_set:
+            return self.fixed_broadcast_set
+
+        # Matchmakers are never removed, so a size change means the snapshot is outdated
+        if len(self._matchmakers_snapshot) != len(self.matchmakers):
+            self._matchmakers_snapshot = tuple(self.matchmakers)
+        return random.sample(self._matchmakers_snapshot, min(len(self._matchmakers_snapshot), self.settings.fanout))
+
+    def _broadcast_packet(self, packet: bytes, peers: List[Peer]) -> None:
+        """
+        Send a single serialized packet to multiple peers.
+        The packet is built once by the caller and the same bytes object is handed to the endpoint for every peer.
+        """
+        send = self.endpoint.send
+        for peer in peers:
+            send(peer.address, packet)
+
     def received_block(self, block: MarketBlock) -> None:
         """
         We received a block for the market community.
@@ -738,10 +794,14 @@ class MarketCommunity(Community, BlockListener):
         """
         Add a matchmaker to the set of known matchmakers. Also check whether there are pending deferreds.
         """
-        if matchmaker.public_key.key_to_bin() == self.my_peer.public_key.key_to_bin():
+        if matchmaker.mid in self.matchmaker_mids:
+            return
+
+        if matchmaker.public_key.key_to_bin() == self._my_pubkey_bin:
             return
 
         self.matchmakers.add(matchmaker)
+        self.matchmaker_mids.add(matchmaker.mid)
 
     @synchronized
     async def create_new_tick_block(self, tick: Tick) -> MarketBlock:
@@ -868,21 +928,28 @@ class MarketCommunity(Community, BlockListener):
         Process an incoming tick.
         :param tick: the received tick to process
         """
-        self.logger.debug("%s received from trader %s, asset pair: %s", type(tick),
-                          tick.order_id.trader_id.as_hex(), tick.assets)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s received from trader %s, asset pair: %s", type(tick),
+                              tick.order_id.trader_id.as_hex(), tick.assets)
 
         if self.is_matchmaker:
-            insert_method = self.order_book.insert_ask if isinstance(tick, Ask) else self.order_book.insert_bid
-
             if not self.order_book.tick_exists(tick.order_id) and tick.order_id not in self.cancelled_orders:
                 self.logger.info("Inserting tick %s from %s, asset pair: %s", tick, tick.order_id, tick.assets)
-                insert_method(tick)
+                self._tick_insert_methods[type(tick)](tick)
 
                 if self.order_book.tick_exists(tick.order_id):
                     # Check for new matches against the orders of this node
-                    for order in self.order_manager.order_repository.find_all():
-                        order_tick_entry = self.order_book.get_tick(order.order_id)
-                        if not order.is_valid() or not order_tick_entry:
+                    now = int(time.time() * 1000)
+                    for order_id in list(self._open_own_orders):
+                        order_tick_entry = self.order_book.get_tick(order_id)
+                        if not order_tick_entry:
+                            # The order book removes ticks that time out or complete, so check the order itself
+                            order = self.order_manager.order_repository.find_by_id(order_id)
+                            if not order or not order.is_valid() or order.is_complete():
+                                self._open_own_orders.discard(order_id)
+                            continue
+                        if not order_tick_entry.is_valid(now):
+                            self._open_own_orders.discard(order_id)
                             continue
 
                         self.match(order_tick_entry.tick)
@@ -894,51 +961,104 @@ class MarketCommunity(Community, BlockListener):
         for tick_entry in matching_ticks:
             self.send_match_message(tick_entry.tick, order_id)
 
+    def _sent_match_bit(self, recipient_order_id: OrderId, order_id: OrderId) -> int:
+        return (hash(recipient_order_id) ^ (hash(order_id) * 0x9E3779B97F4A7C15)) & (self.SENT_MATCHES_BLOOM_BITS - 1)
+
+    def has_sent_match(self, recipient_order_id: OrderId, order_id: OrderId) -> bool:
+        """
+        Return whether we already sent a match message for the given recipient and tick order.
+        The bitmap filters out pairs we have never seen, before falling back to the exact (but bounded) record.
+        """
+        bit = self._sent_match_bit(recipient_order_id, order_id)
+        if not self._sent_matches_bloom[bit >> 3] & (1 << (bit & 7)):
+            return False
+        return (recipient_order_id, order_id) in self.sent_matches
+
+    def add_sent_match(self, recipient_order_id: OrderId, order_id: OrderId) -> None:
+        """
+        Remember that we sent a match message for the given recipient and tick order.
+        """
+        self._set_sent_match_bit(recipient_order_id, order_id)
+        self.sent_matches[(recipient_order_id, order_id)] = None
+        if len(self.sent_matches) > self.settings.max_sent_matches:
+            self.sent_matches.popitem(last=False)
+            self._sent_matches_evicted += 1
+            if self._sent_matches_evicted >= self.settings.max_sent_matches:
+                self.rebuild_sent_matches_bloom()
+
+    def _set_sent_match_bit(self, recipient_order_id: OrderId, order_id: OrderId) -> None:
+        bit = self._sent_match_bit(recipient_order_id, order_id)
+        self._sent_matches_bloom[bit >> 3] |= 1 << (bit & 7)
+
+    def rebuild_sent_matches_bloom(self) -> None:
+        """
+        Rebuild the bitmap from the pairs that are still in sent_matches. Bits of evicted pairs are never unset, so we
+        do this every time the record has wrapped around once, to keep the bitmap from filling up.
+        """
+        self._sent_matches_bloom = bytearray(self.SENT_MATCHES_BLOOM_BITS // 8)
+        for recipient_order_id, order_id in self.sent_matches:
+            self._set_sent_match_bit(recipient_order_id, order_id)
+        self._sent_matches_evicted = 0
+
     def send_match_message(self, tick: Tick, recipient_order_id: OrderId) -> None:
         """
         Send a match message to a specific node
         :param tick: The matched tick
         :param recipient_order_id: The order id of the recipient, matching the tick
         """
-        if (recipient_order_id, tick.order_id) in self.sent_matches:
+        if self.has_sent_match(recipient_order_id, tick.order_id):
             return
-        self.sent_matches.add((recipient_order_id, tick.order_id))
+        self.add_sent_match(recipient_order_id, tick.order_id)
 
         payload_tup = tick.to_network()
 
         # Add recipient order number, matched quantity, trader ID of the matched person, our own trader ID and match ID
-        my_id = TraderId(self.mid)
-        payload_tup += (recipient_order_id.order_number, tick.order_id.trader_id, my_id)
+        payload_tup += (recipient_order_id.order_number, tick.order_id.trader_id, self._my_trader_id)
 
-        async def get_address():
-            try:
-                address = await self.get_address_for_trader(recipient_order_id.trader_id)
-            except RuntimeError:
-                address = None
+        # Matches that arrive while a flush is pending or running join that flush. Waiting half the interval keeps the
+        # average delay of a match at the interval, like scheduling a separate send per match did.
+        self._pending_match_sends.append((payload_tup, tick.order_id, recipient_order_id))
+        if not self.is_pending_task_active("flush_match_sends"):
+            self.register_task("flush_match_sends", self.flush_match_sends, delay=self.settings.match_send_interval / 2)
 
-            if not address:
-                return
+    async def flush_match_sends(self) -> None:
+        """
+        Send all queued match messages at once, so a burst of matches only schedules a single task.
+        """
+        while self._pending_match_sends:
+            pending_match_sends, self._pending_match_sends = self._pending_match_sends, []
+            await gather(*[self.send_match_payload(*pending_match_send) for pending_match_send in pending_match_sends])
 
-            self.logger.info("Sending match message for order id %s and tick order id %s to trader %s",
-                             str(recipient_order_id), str(tick.order_id), recipient_order_id.trader_id.as_hex())
+    async def send_match_payload(self, payload_tup: Tuple, order_id: OrderId, recipient_order_id: OrderId) -> None:
+        """
+        Resolve the address of the recipient and send the match message to it.
+        """
+        try:
+            address = await self.get_address_for_trader(recipient_order_id.trader_id)
+        except RuntimeError:
+            address = None
 
-            auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-            payload = MatchPayload(*payload_tup)
+        if not address:
+            return
 
-            packet = self._ez_pack(self._prefix, MSG_MATCH, [auth, payload])
-            self.endpoint.send(address, packet)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Sending match message for order id %s and tick order id %s to trader %s",
+                             recipient_order_id, order_id, recipient_order_id.trader_id.as_hex())
+
+        payload = MatchPayload(*payload_tup)
 
-        self.register_task('get_address_for_trader_%s-%s' % (recipient_order_id, tick.order_id), get_address,
-                           delay=random.uniform(0, self.settings.match_send_interval))
+        packet = self._ez_pack_auth(MSG_MATCH, [payload])
+        self.endpoint.send(address, packet)
 
     @lazy_wrapper(MatchPayload)
     def received_match(self, peer: Peer, payload: MatchPayload) -> None:
         """
         We received a match message from a matchmaker.
         """
-        self.logger.info("We received a match message from %s for order %s.%s (matched against %s.%s)",
-                         payload.matchmaker_trader_id.as_hex(), TraderId(self.mid).as_hex(),
-                         payload.recipient_order_number, payload.trader_id.as_hex(), payload.order_number)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("We received a match message from %s for order %s.%s (matched against %s.%s)",
+                             payload.matchmaker_trader_id.as_hex(), self._my_trader_id.as_hex(),
+                             payload.recipient_order_number, payload.trader_id.as_hex(), payload.order_number)
 
         # We got a match, check whether we can respond to this match
         self.update_ip(payload.matchmaker_trader_id, peer.address)
@@ -950,7 +1070,7 @@ class MarketCommunity(Community, BlockListener):
         """
         Process a match payload.
         """
-        order_id = OrderId(TraderId(self.mid), payload.recipient_order_number)
+        order_id = OrderId(self._my_trader_id, payload.recipient_order_number)
         order = self.order_manager.order_repository.find_by_id(order_id)
         if not order:
             self.logger.warning("Cannot find order %s in order repository!", order_id)
@@ -965,7 +1085,7 @@ class MarketCommunity(Community, BlockListener):
             self.send_decline_match_message(order, other_order_id, payload.matchmaker_trader_id, decline_reason)
             return
 
-        cache = self.request_cache.get("match", int(payload.recipient_order_number))
+        cache = self.get_match_cache(payload.recipient_order_number)
         if not cache:
             cache = MatchCache(self, order)
             self.request_cache.add(cache)
@@ -979,17 +1099,18 @@ class MarketCommunity(Community, BlockListener):
         Accept an incoming match payload and propose a trade to the counterparty
         """
         if should_reserve:
-            if order.available_quantity == 0:
+            available_quantity = order.available_quantity
+            if available_quantity == 0:
                 self.logger.info("No available quantity for order %s - not sending outgoing proposal", order.order_id)
 
                 # Notify the match cache
-                cache = self.request_cache.get("match", int(order.order_id.order_number))
+                cache = self.get_match_cache(order.order_id.order_number)
                 if cache:
                     cache.received_decline_trade(other_order_id, DeclinedTradeReason.NO_AVAILABLE_QUANTITY)
                 return
 
             # Pre-actively reserve the available quantity in the order
-            propose_quantity = min(order.available_quantity, other_quantity)
+            propose_quantity = min(available_quantity, other_quantity)
             order.reserve_quantity_for_tick(other_order_id, propose_quantity)
             self.order_manager.order_repository.update(order)
 
@@ -1015,7 +1136,7 @@ class MarketCommunity(Community, BlockListener):
             self.order_manager.order_repository.update(order)
 
             # Notify the match cache
-            cache = self.request_cache.get("match", int(order.order_id.order_number))
+            cache = self.get_match_cache(order.order_id.order_number)
             if cache:
                 cache.received_decline_trade(other_order_id, decline_reason)
             return
@@ -1027,7 +1148,7 @@ class MarketCommunity(Community, BlockListener):
         propose_quantity_scaled = AssetPair.from_price(other_price, propose_quantity)
 
         propose_trade = Trade.propose(
-            TraderId(self.mid),
+            self._my_trader_id,
             order.order_id,
             other_order_id,
             propose_quantity_scaled,
@@ -1047,22 +1168,26 @@ class MarketCommunity(Community, BlockListener):
             order.release_quantity_for_tick(other_order_id, propose_quantity)
 
             # Notify the match cache
-            cache = self.request_cache.get("match", int(order.order_id.order_number))
+            cache = self.get_match_cache(order.order_id.order_number)
             if cache:
                 cache.received_decline_trade(other_order_id, DeclinedTradeReason.ADDRESS_LOOKUP_FAIL)
 
     def send_decline_match_message(self, order: Order, other_order_id: OrderId,
                                    matchmaker_trader_id: TraderId, decline_reason: DeclineMatchReason) -> None:
         address = self.lookup_ip(matchmaker_trader_id)
+        if not address:
+            self.logger.warning("Unknown address of trader %s, not sending decline match message",
+                                matchmaker_trader_id.as_hex())
+            return
 
-        self.logger.info("Sending decline match message for order %s to trader %s (ip: %s, port: %s)",
-                         order.order_id, matchmaker_trader_id.as_hex(), *address)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Sending decline match message for order %s to trader %s (ip: %s, port: %s)",
+                             order.order_id, matchmaker_trader_id.as_hex(), *address)
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = (TraderId(self.mid), Timestamp.now(), order.order_id.order_number, other_order_id, decline_reason)
+        payload = (self._my_trader_id, Timestamp.now(), order.order_id.order_number, other_order_id, decline_reason)
         payload = DeclineMatchPayload(*payload)
 
-        packet = self._ez_pack(self._prefix, MSG_MATCH_DECLINE, [auth, payload])
+        packet = self._ez_pack_auth(MSG_MATCH_DECLINE, [payload])
         self.endpoint.send(address, packet)
 
     @lazy_wrapper(DeclineMatchPayload)
@@ -1098,6 +1223,7 @@ class MarketCommunity(Community, BlockListener):
         order = self.order_manager.order_repository.find_by_id(order_id)
         if order and (order.status == "open" or order.status == "unverified"):
             self.order_manager.cancel_order(order_id)
+            self._open_own_orders.discard(order_id)
 
             if self.is_matchmaker:
                 self.order_book.remove_tick(order_id)
@@ -1111,6 +1237,7 @@ class MarketCommunity(Community, BlockListener):
         """
         An order has been completed. Update the match caches accordingly
         """
+        self._open_own_orders.discard(order_id)
         for cache in self.get_match_caches():
             cache.remove_order(order_id)
 
@@ -1120,15 +1247,14 @@ class MarketCommunity(Community, BlockListener):
 
         self.request_cache.add(ProposedTradeRequestCache(self, proposed_trade))
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
         payload = TradePayload(*payload)
 
-        self.logger.debug("Sending proposed trade with own order id %s and other order id %s to trader "
-                          "%s, asset pair %s", str(proposed_trade.order_id),
-                          str(proposed_trade.recipient_order_id), proposed_trade.recipient_order_id.trader_id.as_hex(),
-                          proposed_trade.assets)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Sending proposed trade with own order id %s and other order id %s to trader "
+                              "%s, asset pair %s", proposed_trade.order_id, proposed_trade.recipient_order_id,
+                              proposed_trade.recipient_order_id.trader_id.as_hex(), proposed_trade.assets)
 
-        packet = self._ez_pack(self._prefix, MSG_PROPOSED_TRADE, [auth, payload])
+        packet = self._ez_pack_auth(MSG_PROPOSED_TRADE, [payload])
         self.endpoint.send(address, packet)
 
     def check_trade_payload_validity(self, payload: TradePayload) -> Tuple[bool, str]:
@@ -1141,16 +1267,19 @@ class MarketCommunity(Community, BlockListener):
         return True, ""
 
     def get_outstanding_proposals(self, order_id: OrderId, partner_order_id: OrderId) -> List[Tuple[int, RequestCache]]:
-        return [(proposal_id, cache) for proposal_id, cache in self.request_cache._identifiers.items()
-                if isinstance(cache, ProposedTradeRequestCache)
-                and cache.proposed_trade.order_id == order_id
-                and cache.proposed_trade.recipient_order_id == partner_order_id]
+        return list(self.request_cache.proposed_trade_caches.get((order_id, partner_order_id), {}).items())
+
+    def get_match_cache(self, order_number: OrderNumber) -> Optional[MatchCache]:
+        """
+        Return the match cache of one of our orders, if there is one.
+        """
+        return self.request_cache.match_caches.get(order_number.order_number)
 
     def get_match_caches(self) -> List[MatchCache]:
         """
         Return all match caches.
         """
-        return [cache for cache in self.request_cache._identifiers.values() if isinstance(cache, MatchCache)]
+        return list(self.request_cache.match_caches.values())
 
     @lazy_wrapper(TradePayload)
     async def received_proposed_trade(self, peer: Peer, payload: TradePayload) -> None:
@@ -1161,8 +1290,9 @@ class MarketCommunity(Community, BlockListener):
 
         proposed_trade = ProposedTrade.from_network(payload)
 
-        self.logger.debug("Proposed trade received from trader %s for order %s",
-                          proposed_trade.trader_id.as_hex(), str(proposed_trade.recipient_order_id))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Proposed trade received from trader %s for order %s",
+                              proposed_trade.trader_id.as_hex(), proposed_trade.recipient_order_id)
 
         # Update the known IP address of the sender of this proposed trade
         self.update_ip(proposed_trade.trader_id, peer.address)
@@ -1175,33 +1305,35 @@ class MarketCommunity(Community, BlockListener):
         outstanding_proposals = self.get_outstanding_proposals(order.order_id, proposed_trade.order_id)
         if outstanding_proposals:
             # Discard current outstanding proposed trade and continue
-            for proposal_id, _ in outstanding_proposals:
-                request = self.request_cache.get("proposed-trade", int(proposal_id.split(':')[1]))
-                eq_and_ask = order.assets.first.amount == request.proposed_trade.assets.first.amount and order.is_ask()
-                have_largest_order = order.assets.first.amount > request.proposed_trade.assets.first.amount
+            order_quantity = order.total_quantity
+            for proposal_id, request in outstanding_proposals:
+                proposed_quantity = request.proposed_trade.assets.first.amount
+                eq_and_ask = order_quantity == proposed_quantity and order.is_ask()
+                have_largest_order = order_quantity > proposed_quantity
                 if eq_and_ask or have_largest_order:
                     self.logger.info("Discarding current outstanding proposals for order %s", proposed_trade.order_id)
-                    self.request_cache.pop("proposed-trade", int(proposal_id.split(':')[1]))
+                    self.request_cache.pop("proposed-trade", proposal_id)
                     request.on_timeout()
 
-        if order.available_quantity == 0:
+        available_quantity = order.available_quantity
+        if available_quantity == 0:
             # No quantity available in this order, decline
             decline_reason = DeclinedTradeReason.ORDER_COMPLETED if order.status == "completed" else DeclinedTradeReason.ORDER_RESERVED
-            declined_trade = Trade.decline(TraderId(self.mid), Timestamp.now(), proposed_trade, decline_reason)
+            declined_trade = Trade.decline(self._my_trader_id, Timestamp.now(), proposed_trade, decline_reason)
             self.send_decline_trade(declined_trade)
             return
 
         # Pre-actively reserve quantity in the order
         quantity_in_propose = proposed_trade.assets.first.amount
-        should_counter = quantity_in_propose > order.available_quantity
-        reserve_quantity = min(quantity_in_propose, order.available_quantity)
+        should_counter = quantity_in_propose > available_quantity
+        reserve_quantity = min(quantity_in_propose, available_quantity)
         order.reserve_quantity_for_tick(proposed_trade.order_id, reserve_quantity)
         self.order_manager.order_repository.update(order)
 
         result = await self.should_accept_propose_trade(proposed_trade, order)
         should_trade, decline_reason = result
         if not should_trade:
-            declined_trade = Trade.decline(TraderId(self.mid), Timestamp.now(), proposed_trade, decline_reason)
+            declined_trade = Trade.decline(self._my_trader_id, Timestamp.now(), proposed_trade, decline_reason)
             self.logger.debug("Declined trade made for order id: %s and id: %s "
                               "(valid? %s, available quantity of order: %s, reserved: %s, traded: %s), reason: %s",
                               str(declined_trade.order_id), str(declined_trade.recipient_order_id),
@@ -1215,7 +1347,7 @@ class MarketCommunity(Community, BlockListener):
                 self.accept_proposed_trade(proposed_trade)
             else:  # Not all quantity can be traded
                 new_pair = order.assets.proportional_downscale(first=reserve_quantity)
-                counter_trade = Trade.counter(TraderId(self.mid), new_pair, Timestamp.now(), proposed_trade)
+                counter_trade = Trade.counter(self._my_trader_id, new_pair, Timestamp.now(), proposed_trade)
                 self.logger.debug("Counter trade made with asset pair %s for proposed trade", counter_trade.assets)
                 self.send_counter_trade(counter_trade)
 
@@ -1247,13 +1379,18 @@ class MarketCommunity(Community, BlockListener):
         return should_trade, decline_reason
 
     def send_decline_trade(self, declined_trade: DeclinedTrade) -> None:
+        address = self.lookup_ip(declined_trade.recipient_order_id.trader_id)
+        if not address:
+            self.logger.warning("Unknown address of trader %s, not sending declined trade",
+                                declined_trade.recipient_order_id.trader_id.as_hex())
+            return
+
         payload = declined_trade.to_network()
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
         payload = DeclineTradePayload(*payload)
 
-        packet = self._ez_pack(self._prefix, MSG_DECLINED_TRADE, [auth, payload])
-        self.endpoint.send(self.lookup_ip(declined_trade.recipient_order_id.trader_id), packet)
+        packet = self._ez_pack_auth(MSG_DECLINED_TRADE, [payload])
+        self.endpoint.send(address, packet)
 
     @lazy_wrapper(DeclineTradePayload)
     def received_decline_trade(self, _, payload: DeclineTradePayload) -> None:
@@ -1283,7 +1420,7 @@ class MarketCommunity(Community, BlockListener):
         other_order_id = OrderId(payload.trader_id, payload.order_number)
 
         # Update the cache which will inform the related matchmakers
-        cache = self.request_cache.get("match", int(order.order_id.order_number))
+        cache = self.get_match_cache(order.order_id.order_number)
         if cache:
             cache.received_decline_trade(other_order_id, payload.decline_reason)
 
@@ -1298,11 +1435,17 @@ class MarketCommunity(Community, BlockListener):
 
         self.request_cache.add(ProposedTradeRequestCache(self, counter_trade))
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
+        # The request cache is added regardless, so the reserved quantity is released when we cannot send
+        address = self.lookup_ip(counter_trade.recipient_order_id.trader_id)
+        if not address:
+            self.logger.warning("Unknown address of trader %s, not sending counter trade",
+                                counter_trade.recipient_order_id.trader_id.as_hex())
+            return
+
         payload = TradePayload(*payload)
 
-        packet = self._ez_pack(self._prefix, MSG_COUNTER_TRADE, [auth, payload])
-        self.endpoint.send(self.lookup_ip(counter_trade.recipient_order_id.trader_id), packet)
+        packet = self._ez_pack_auth(MSG_COUNTER_TRADE, [payload])
+        self.endpoint.send(address, packet)
 
     @lazy_wrapper(TradePayload)
     def received_counter_trade(self, _, payload: TradePayload) -> None:
@@ -1334,7 +1477,7 @@ class MarketCommunity(Community, BlockListener):
             should_decline = False
 
         if should_decline:
-            declined_trade = Trade.decline(TraderId(self.mid), Timestamp.now(), counter_trade, decline_reason)
+            declined_trade = Trade.decline(self._my_trader_id, Timestamp.now(), counter_trade, decline_reason)
             self.logger.debug("Declined trade made for order id: %s and id: %s ",
                               str(declined_trade.order_id), str(declined_trade.recipient_order_id))
             self.send_decline_trade(declined_trade)
@@ -1357,14 +1500,23 @@ class MarketCommunity(Community, BlockListener):
             self.accept_proposed_trade(counter_trade)
 
     def accept_proposed_trade(self, proposed_trade: ProposedTrade) -> None:
-        accepted_trade = Trade.accept(TraderId(self.mid), Timestamp.now(), proposed_trade)
+        address = self.lookup_ip(proposed_trade.order_id.trader_id)
+        if not address:
+            self.logger.warning("Unknown address of trader %s, not accepting proposed trade",
+                                proposed_trade.order_id.trader_id.as_hex())
+            # There is no request cache that could release the quantity the caller reserved for this trade
+            order = self.order_manager.order_repository.find_by_id(proposed_trade.recipient_order_id)
+            order.release_quantity_for_tick(proposed_trade.order_id, proposed_trade.assets.first.amount)
+            self.order_manager.order_repository.update(order)
+            return
+
+        accepted_trade = Trade.accept(self._my_trader_id, Timestamp.now(), proposed_trade)
         payload = accepted_trade.to_network()
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
         payload = TradePayload(*payload)
 
-        packet = self._ez_pack(self._prefix, MSG_ACCEPT_TRADE, [auth, payload])
-        self.endpoint.send(self.lookup_ip(proposed_trade.order_id.trader_id), packet)
+        packet = self._ez_pack_auth(MSG_ACCEPT_TRADE, [payload])
+        self.endpoint.send(address, packet)
 
     @lazy_wrapper(TradePayload)
     async def received_accept_trade(self, peer: Peer, payload: TradePayload) -> None:
@@ -1393,10 +1545,9 @@ class MarketCommunity(Community, BlockListener):
         request_future = Future()
         cache = self.request_cache.add(OrderStatusRequestCache(self, request_future))
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = OrderStatusRequestPayload(TraderId(self.mid), Timestamp.now(), order_id, cache.number)
+        payload = OrderStatusRequestPayload(self._my_trader_id, Timestamp.now(), order_id, cache.number)
 
-        packet = self._ez_pack(self._prefix, MSG_ORDER_QUERY, [auth, payload])
+        packet = self._ez_pack_auth(MSG_ORDER_QUERY, [payload])
         self.endpoint.send(self.lookup_ip(order_id.trader_id), packet)
 
         return request_future
@@ -1405,13 +1556,11 @@ class MarketCommunity(Community, BlockListener):
     def received_order_status_request(self, peer: Peer, payload: OrderStatusRequestPayload) -> None:
         order = self.order_manager.order_repository.find_by_id(payload.order_id)
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-
         order_payload = list(order.to_network())
         order_payload.append(payload.identifier)
         new_payload = OrderStatusResponsePayload(*order_payload)
 
-        packet = self._ez_pack(self._prefix, MSG_ORDER_RESPONSE, [auth, new_payload])
+        packet = self._ez_pack_auth(MSG_ORDER_RESPONSE, [new_payload])
         self.endpoint.send(peer.address, packet)
 
     @lazy_wrapper(OrderStatusResponsePayload)
@@ -1457,7 +1606,7 @@ class MarketCommunity(Community, BlockListener):
                               str(transaction.partner_incoming_address), type(e), e)
             return
 
-        payment = Payment(TraderId(self.mid), transaction.transaction_id, transfer_amount,
+        payment = Payment(self._my_trader_id, transaction.transaction_id, transfer_amount,
                           wallet.get_address(), str(transaction.partner_incoming_address), PaymentId(txid),
                           Timestamp.now())
 
@@ -1477,10 +1626,10 @@ class MarketCommunity(Community, BlockListener):
         :param transaction: The completed transaction.
         :param block: The block created by this peer defining the transaction.
         """
-        cache = self.request_cache.get("match", int(transaction.order_id.order_number))
+        cache = self.get_match_cache(transaction.order_id.order_number)
         if cache and cache.order.status != "open":
             # Remove the match request cache
-            self.request_cache.pop("match", int(transaction.order_id.order_number))
+            self.request_cache.pop("match", transaction.order_id.order_number.order_number)
         elif cache:
             cache.did_trade(transaction, block)
 
@@ -1489,10 +1638,23 @@ class MarketCommunity(Community, BlockListener):
         if not self.is_matchmaker:
             return
 
+        # Drop copies of a message we already processed before unpacking it. The 8-byte global time after the prefix
+        # and message id differs per sent message, so we only hash the block pair itself.
+        packet_hash = blake2b(data[len(self._prefix) + 1 + 8:], digest_size=8).digest()
+        if packet_hash in self.received_match_done_hashes:
+            return
+
         _, payload = self._ez_unpack_noauth(HalfBlockPairPayload, data)
         block1, block2 = self.trustchain.get_block_class(payload.type1).from_pair_payload(payload, self.serializer)
-        self.trustchain.validate_persist_block(block1)
-        self.trustchain.validate_persist_block(block2)
+        validation1 = self.trustchain.validate_persist_block(block1)
+        validation2 = self.trustchain.validate_persist_block(block2)
+
+        # Only remember the message once both blocks are persisted, so a copy can still be processed after a failure
+        if validation1[0] != ValidationResult.invalid and validation2[0] != ValidationResult.invalid:
+            self.received_match_done_hashes.add(packet_hash)
+            self.received_match_done_hashes_order.append(packet_hash)
+            if len(self.received_match_done_hashes_order) > self.settings.match_done_history_size:
+                self.received_match_done_hashes.remove(self.received_match_done_hashes_order.popleft())
 
         # Update ticks in order book, release the reserved quantity and find a new match
         tx_dict = block1.transaction
@@ -1502,16 +1664,12 @@ class MarketCommunity(Community, BlockListener):
                                OrderNumber(tx_dict["ask"]["order_number"]))
         bid_order_id = OrderId(TraderId(unhexlify(tx_dict["bid"]["trader_id"])),
                                OrderNumber(tx_dict["bid"]["order_number"]))
+        # The order of the sender is either the ask or the bid, so this also finds new matches for the sender
         self.match_order_ids([ask_order_id, bid_order_id])
 
         # Broadcast the pair of blocks
         self.broadcast_block_pair(block1, block2)
 
-        order_id = OrderId(TraderId(unhexlify(tx_dict["tx"]["trader_id"])), OrderNumber(tx_dict["tx"]["order_number"]))
-        tick_entry_sender = self.order_book.get_tick(order_id)
-        if tick_entry_sender:
-            self.match(tick_entry_sender.tick)
-
     def send_trader_pk_request(self, trader_id: TraderId) -> Future:
         if trader_id in self.pk_register:
             return succeed(self.pk_register[trader_id])
@@ -1521,20 +1679,18 @@ class MarketCommunity(Community, BlockListener):
         request_future = Future()
         cache = self.request_cache.add(PublicKeyRequestCache(self, trader_id, request_future))
 
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        payload = PublicKeyPayload(TraderId(self.mid), Timestamp.now(), cache.number)
+        payload = PublicKeyPayload(self._my_trader_id, Timestamp.now(), cache.number)
 
-        packet = self._ez_pack(self._prefix, MSG_PK_QUERY, [auth, payload])
+        packet = self._ez_pack_auth(MSG_PK_QUERY, [payload])
         self.endpoint.send(self.lookup_ip(trader_id), packet)
 
         return request_future
 
     @lazy_wrapper(PublicKeyPayload)
     def received_trader_pk_request(self, peer: Peer, payload: PublicKeyPayload) -> None:
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
-        new_payload = PublicKeyPayload(TraderId(self.mid), Timestamp.now(), payload.identifier)
+        new_payload = PublicKeyPayload(self._my_trader_id, Timestamp.now(), payload.identifier)
 
-        packet = self._ez_pack(self._prefix, MSG_PK_RESPONSE, [auth, new_payload])
+        packet = self._ez_pack_auth(MSG_PK_RESPONSE, [new_payload])
         self.endpoint.send(peer.address, packet)
 
     @lazy_wrapper(PublicKeyPayload)
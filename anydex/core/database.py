@@ -116,7 +116,7 @@ class MarketDB(TrustChainDB):
         """
         db_result = self.execute(u"SELECT * FROM orders")
         return [Order.from_database(db_item, self.get_reserved_ticks(
-            OrderId(TraderId(bytes(db_item[0])), OrderNumber(db_item[1])))) for db_item in db_result]
+            OrderId(TraderId.get(db_item[0]), OrderNumber.get(db_item[1])))) for db_item in db_result]
 
     def get_order(self, order_id):
         """
@@ -186,7 +186,7 @@ class MarketDB(TrustChainDB):
         """
         db_results = self.execute(u"SELECT * FROM orders_reserved_ticks WHERE trader_id = ? AND order_number = ?",
                                   (bytes(order_id.trader_id), str(order_id.order_number)))
-        return [(OrderId(TraderId(bytes(data[2])), OrderNumber(data[3])), data[4]) for data in db_results]
+        return [(OrderId(TraderId.get(data[2]), OrderNumber.get(data[3])), data[4]) for data in db_results]
 
     def get_all_transactions(self):
         """
@@ -1,50 +1,52 @@
-from functools import cmp_to_key
+import heapq
+from itertools import count
 
 
 class MatchPriorityQueue(object):
     """
     This priority queue keeps track of incoming match message for a specific order.
+    Items with fewer retries come first. Items with the same number of retries are ordered by price: the highest price
+    first if our order is an ask, the lowest price first if our order is a bid.
     """
     def __init__(self, order):
         self.order = order
-        self.queue = []
+        self.queue = []  # Heap of (retries, signed price, insertion number, item) entries
+        self._price_sign = -1 if order.is_ask() else 1
+        self._counter = count()  # Breaks ties between entries in insertion order
+        self._order_ids = {}  # The number of queued items per order id
 
     def __str__(self):
-        return ' '.join([str(i) for i in self.queue])
+        return ' '.join([str(entry[3]) for entry in sorted(self.queue)])
 
     def is_empty(self):
         return len(self.queue) == 0
 
     def contains_order(self, order_id):
-        for _, _, other_order_id, _ in self.queue:
-            if other_order_id == order_id:
-                return True
-        return False
+        return order_id in self._order_ids
 
     def insert(self, retries, price, order_id, other_quantity):
-        self.queue.append((retries, price, order_id, other_quantity))
-
-        def cmp_items(tup1, tup2):
-            if tup1[0] < tup2[0]:
-                return -1
-            elif tup1[0] > tup2[0]:
-                return 1
-            else:
-                if self.order.is_ask():
-                    if tup1[1] < tup2[1]:
-                        return 1
-                    else:
-                        return -1
-                else:
-                    if tup1[1] < tup2[1]:
-                        return -1
-                    else:
-                        return 1
-
-        self.queue = sorted(self.queue, key=cmp_to_key(cmp_items))
+        item = (retries, price, order_id, other_quantity)
+        heapq.heappush(self.queue, (retries, self._price_sign * price.amount, next(self._counter), item))
+        self._order_ids[order_id] = self._order_ids.get(order_id, 0) + 1
 
     def delete(self):
         if not self.queue:
             return None
 
-        return self.queue.pop(0)
+        item = heapq.heappop(self.queue)[3]
+        order_id = item[2]
+        if self._order_ids[order_id] == 1:
+            del self._order_ids[order_id]
+        else:
+            self._order_ids[order_id] -= 1
+        return item
+
+    def remove_order(self, order_id):
+        """
+        Remove all items from the queue that match the passed order id.
+        """
+        if self._order_ids.pop(order_id, None) is None:
+            return
+
+        self.queue = [entry for entry in self.queue if entry[3][2] != order_id]
+        heapq.heapify(self.queue)
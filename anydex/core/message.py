@@ -1,9 +1,15 @@
 from binascii import hexlify
+from weakref import WeakValueDictionary
+
+
+_trader_ids = WeakValueDictionary()  # The TraderId instances that are currently in use, by their bytes
 
 
 class TraderId(object):
     """Immutable class for representing the id of a trader."""
 
+    __slots__ = ('trader_id', '_hex', '__weakref__')
+
     def __init__(self, trader_id):
         """
         :param trader_id: String representing the trader id
@@ -12,12 +18,31 @@ class TraderId(object):
         """
         super(TraderId, self).__init__()
 
-        trader_id = trader_id if isinstance(trader_id, bytes) else bytes(trader_id)
+        if not isinstance(trader_id, bytes):
+            trader_id = bytes(trader_id)
 
         if len(trader_id) != 20:
             raise ValueError("Trader ID must be 20 bytes")
 
         self.trader_id = trader_id  # type: bytes
+        self._hex = None  # The hex representation of the trader id, computed on first use
+
+    @classmethod
+    def get(cls, trader_id):
+        """
+        Return a shared TraderId instance for the given trader id, so repeated decodes of the same trader id do not
+        allocate and validate a new object each time.
+        :param trader_id: The bytes of the trader id
+        :type trader_id: bytes
+        :rtype: TraderId
+        """
+        if not isinstance(trader_id, bytes):
+            trader_id = bytes(trader_id)
+
+        instance = _trader_ids.get(trader_id)
+        if instance is None:
+            instance = _trader_ids[trader_id] = cls(trader_id)
+        return instance
 
     def __str__(self):
         return "%s" % self.trader_id
@@ -26,10 +51,12 @@ class TraderId(object):
         return self.trader_id
 
     def as_hex(self):
-        return hexlify(bytes(self)).decode('utf-8')
+        if self._hex is None:
+            self._hex = hexlify(self.trader_id).decode('utf-8')
+        return self._hex
 
     def __eq__(self, other):
-        return self.trader_id == other.trader_id
+        return isinstance(other, TraderId) and self.trader_id == other.trader_id
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -41,6 +68,8 @@ class TraderId(object):
 class Message(object):
     """Abstract class for representing a message."""
 
+    __slots__ = ('_trader_id', '_timestamp')
+
     def __init__(self, trader_id, timestamp):
         """
         Don't use this class directly, use on of its implementations
@@ -1,4 +1,6 @@
 import logging
+import sys
+from weakref import WeakValueDictionary
 
 from anydex.core.assetamount import AssetAmount
 from anydex.core.assetpair import AssetPair
@@ -12,9 +14,14 @@ class TickWasNotReserved(Exception):
     pass
 
 
+_order_numbers = WeakValueDictionary()  # The OrderNumber instances that are currently in use, by their number
+
+
 class OrderNumber(object):
     """Immutable class for representing the number of an order."""
 
+    __slots__ = ('order_number', '__weakref__')
+
     def __init__(self, order_number):
         """
         :param order_number: Integer representing the number of an order
@@ -28,9 +35,25 @@ class OrderNumber(object):
 
         self.order_number = order_number
 
+    @classmethod
+    def get(cls, order_number):
+        """
+        Return a shared OrderNumber instance for the given number.
+        :param order_number: Integer representing the number of an order
+        :type order_number: int
+        :rtype: OrderNumber
+        """
+        instance = _order_numbers.get(order_number)
+        if instance is None:
+            instance = _order_numbers[order_number] = cls(order_number)
+        return instance
+
     def __int__(self):
         return self.order_number
 
+    def __index__(self):
+        return self.order_number
+
     def __str__(self):
         return "%s" % self.order_number
 
@@ -47,6 +70,8 @@ class OrderNumber(object):
 class OrderId(object):
     """Immutable class for representing the id of an order."""
 
+    __slots__ = ('trader_id', 'order_number', '_key', '_hash', '_str')
+
     def __init__(self, trader_id, order_number):
         """
         :param trader_id: The trader id who created the order
@@ -58,19 +83,23 @@ class OrderId(object):
 
         self.trader_id = trader_id
         self.order_number = order_number
-        self._hash = hash((self.trader_id, self.order_number))
+        self._key = (trader_id.trader_id, order_number.order_number)  # Compared and hashed instead of the two ids
+        self._hash = hash(self._key)
+        self._str = None  # The string representation of the order id, computed on first use
 
     def __str__(self):
         """
         format: <trader_id>.<order_number>
         """
-        return "%s.%d" % (self.trader_id.as_hex(), self.order_number)
+        if self._str is None:
+            self._str = "%s.%d" % (self.trader_id.as_hex(), int(self.order_number))
+        return self._str
 
     def __bytes__(self):
-        return b"%s.%d" % (self.trader_id.as_hex().encode('utf-8'), self.order_number)
+        return str(self).encode('utf-8')
 
     def __eq__(self, other):
-        return self.trader_id == other.trader_id and self.order_number == other.order_number
+        return isinstance(other, OrderId) and self._key == other._key
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -82,6 +111,10 @@ class OrderId(object):
 class Order(object):
     """Class for representing an ask or a bid created by the user"""
 
+    __slots__ = ('_logger', '_order_id', '_assets', '_reserved_quantity', '_traded_quantity', '_received_quantity',
+                 '_timeout', '_timestamp', '_completed_timestamp', '_is_ask', '_reserved_ticks', '_cancelled',
+                 '_verified', 'broadcast_peers', '_db_prefix', '_price')
+
     def __init__(self, order_id, assets, timeout, timestamp, is_ask):
         """
         :param order_id: An order id to identify the order
@@ -100,6 +133,7 @@ class Order(object):
 
         self._order_id = order_id
         self._assets = assets
+        self._price = assets.price  # The assets of an order do not change, so neither does its price
         self._reserved_quantity = 0
         self._traded_quantity = 0
         self._received_quantity = 0
@@ -111,6 +145,9 @@ class Order(object):
         self._cancelled = False
         self._verified = False
         self.broadcast_peers = []
+        # The order id and assets never change, so their database columns are only converted once
+        self._db_prefix = (bytes(order_id.trader_id), str(order_id.order_number),
+                           assets.first.amount, assets.first.asset_id, assets.second.amount, assets.second.asset_id)
 
     @classmethod
     def from_database(cls, data, reserved_ticks):
@@ -120,9 +157,9 @@ class Order(object):
         (trader_id, order_number, asset1_amount, asset1_type, asset2_amount, asset2_type, traded_quantity,
          received_quantity, timeout, order_timestamp, completed_timestamp, is_ask, cancelled, verified) = data
 
-        order_id = OrderId(TraderId(bytes(trader_id)), OrderNumber(order_number))
-        order = cls(order_id, AssetPair(AssetAmount(asset1_amount, asset1_type.decode()),
-                                        AssetAmount(asset2_amount, asset2_type.decode())),
+        order_id = OrderId(TraderId.get(trader_id), OrderNumber.get(order_number))
+        order = cls(order_id, AssetPair(AssetAmount(asset1_amount, sys.intern(asset1_type.decode())),
+                                        AssetAmount(asset2_amount, sys.intern(asset2_type.decode()))),
                     Timeout(timeout), Timestamp(order_timestamp), bool(is_ask))
         order._traded_quantity = traded_quantity
         order._received_quantity = received_quantity
@@ -142,12 +179,10 @@ class Order(object):
         Returns a database representation of an Order object.
         :rtype: tuple
         """
-        completed_timestamp = int(self.completed_timestamp) if self.completed_timestamp else None
-        return (bytes(self.order_id.trader_id), str(self.order_id.order_number),
-                self.assets.first.amount, self.assets.first.asset_id, self.assets.second.amount,
-                self.assets.second.asset_id, self.traded_quantity, self._received_quantity,
-                int(self.timeout), int(self.timestamp), completed_timestamp, self.is_ask(), self._cancelled,
-                self._verified)
+        completed_timestamp = int(self._completed_timestamp) if self._completed_timestamp else None
+        return self._db_prefix + (self._traded_quantity, self._received_quantity, int(self._timeout),
+                                  int(self._timestamp), completed_timestamp, self._is_ask, self._cancelled,
+                                  self._verified)
 
     @property
     def reserved_ticks(self):
@@ -175,7 +210,7 @@ class Order(object):
         """
         :rtype: Price
         """
-        return self.assets.price
+        return self._price
 
     @property
     def total_quantity(self):
@@ -261,7 +296,8 @@ class Order(object):
         we are interested in.
         :rtype: bool
         """
-        return self._traded_quantity >= self.assets.first.amount and self._received_quantity >= self.assets.second.amount
+        assets = self._assets
+        return self._traded_quantity >= assets.first.amount and self._received_quantity >= assets.second.amount
 
     @property
     def status(self):
@@ -270,7 +306,7 @@ class Order(object):
         :return: The status of this order
         :rtype: str
         """
-        if not self.verified:
+        if not self._verified:
             return "unverified"
         if self._cancelled:
             return "cancelled"
@@ -285,12 +321,20 @@ class Order(object):
         Return whether an incoming trade proposal has an acceptable price.
         :rtype: bool
         """
-        my_price = self.assets.price
-        other_price = proposal_assets.price
-        return (self.is_ask() and (
-                    my_price <= other_price or abs(float(my_price.frac - other_price.frac)) < 0.0001)) or (
-                           not self.is_ask() and (
-                               my_price >= other_price or abs(float(my_price.frac - other_price.frac)) < 0.0001))
+        if self._assets.first.asset_id != proposal_assets.first.asset_id or \
+                self._assets.second.asset_id != proposal_assets.second.asset_id:
+            return False
+
+        # Compare both prices (second amount / first amount) by cross-multiplying the integer amounts
+        my_first_amount = self._assets.first.amount
+        other_first_amount = proposal_assets.first.amount
+        my_scaled_price = self._assets.second.amount * other_first_amount
+        other_scaled_price = proposal_assets.second.amount * my_first_amount
+
+        # Prices that differ less than 0.0001 are always acceptable
+        if abs(my_scaled_price - other_scaled_price) * 10000 < my_first_amount * other_first_amount:
+            return True
+        return my_scaled_price <= other_scaled_price if self._is_ask else my_scaled_price >= other_scaled_price
 
     def set_verified(self):
         """
@@ -309,17 +353,14 @@ class Order(object):
         """
         if self.available_quantity >= quantity:
             self._reserved_quantity += quantity
-            if order_id not in self._reserved_ticks:
-                self._reserved_ticks[order_id] = quantity
-            else:
-                self._reserved_ticks[order_id] += quantity
+            self._reserved_ticks[order_id] = self._reserved_ticks.get(order_id, 0) + quantity
         else:
             raise ValueError("Order %s does not have enough available quantity for reservation", self.order_id)
 
         self._logger.debug("Reserved %d quantity for order id %s (own order id: %s),"
                            "total quantity: %d, traded quantity: %d, reserved quantity: %d",
-                           quantity, str(order_id), str(self.order_id), self.total_quantity, self.traded_quantity,
-                           self.reserved_quantity)
+                           quantity, order_id, self.order_id, self.total_quantity, self._traded_quantity,
+                           self._reserved_quantity)
 
     def release_quantity_for_tick(self, order_id, quantity):
         """
@@ -328,23 +369,32 @@ class Order(object):
         :type order_id: OrderId
         :raises TickWasNotReserved: Thrown when the tick was not reserved first
         """
-        if order_id not in self._reserved_ticks:
-            raise TickWasNotReserved()
+        self._release_reserved(order_id, quantity)
 
-        if self._reserved_quantity >= quantity:
-            self._reserved_quantity -= quantity
-            self._reserved_ticks[order_id] -= quantity
-            assert self.available_quantity >= 0, str(self.available_quantity)
+        self._logger.debug("Released quantity for order id %s (own order id: %s),"
+                           "total quantity: %d, traded quantity: %d, reserved quantity: %d",
+                           order_id, self.order_id, self.total_quantity, self._traded_quantity,
+                           self._reserved_quantity)
 
-            if self._reserved_ticks[order_id] <= 0:  # Remove the quantity if it's zero
-                del self._reserved_ticks[order_id]
-        else:
+    def _release_reserved(self, order_id, quantity):
+        """
+        Update the reservation counters after releasing quantity for a tick.
+        :raises TickWasNotReserved: Thrown when the tick was not reserved first
+        """
+        reserved_for_tick = self._reserved_ticks.get(order_id)
+        if reserved_for_tick is None:
+            raise TickWasNotReserved()
+
+        if self._reserved_quantity < quantity:
             raise ValueError("Not enough reserved quantity for order id %s" % order_id)
 
-        self._logger.debug("Released quantity for order id %s (own order id: %s),"
-                           "total quantity: %d, traded quantity: %d, reserved quantity: %d",
-                           str(order_id), str(self.order_id), self.total_quantity, self.traded_quantity,
-                           self.reserved_quantity)
+        self._reserved_quantity -= quantity
+        assert self.available_quantity >= 0, str(self.available_quantity)
+
+        if reserved_for_tick - quantity <= 0:  # Remove the quantity if it's zero
+            del self._reserved_ticks[order_id]
+        else:
+            self._reserved_ticks[order_id] = reserved_for_tick - quantity
 
     def is_valid(self):
         """
@@ -358,13 +408,14 @@ class Order(object):
 
     def add_trade(self, other_order_id, transferred_assets):
         self._logger.debug("Adding trade for order %s with quantity %s (other id: %s)",
-                           str(self.order_id), transferred_assets, str(other_order_id))
+                           self.order_id, transferred_assets, other_order_id)
 
-        if transferred_assets.asset_id == self.assets.first.asset_id:
-            self._traded_quantity += transferred_assets.amount
-            self.release_quantity_for_tick(other_order_id, transferred_assets.amount)
+        amount = transferred_assets.amount
+        if transferred_assets.asset_id == self._assets.first.asset_id:
+            self._traded_quantity += amount
+            self._release_reserved(other_order_id, amount)
         else:
-            self._received_quantity += transferred_assets.amount
+            self._received_quantity += amount
 
         if self.is_complete():
             self._completed_timestamp = Timestamp.now()
@@ -27,6 +27,7 @@ class OrderBook(TaskManager):
         self._logger = logging.getLogger(self.__class__.__name__)
         self._bids = Side()
         self._asks = Side()
+        self._tick_by_id = {}  # Map: OrderId -> TickEntry, for the ticks on both sides
         self.completed_orders = set()
 
     def timeout_ask(self, order_id):
@@ -47,7 +48,7 @@ class OrderBook(TaskManager):
         :type ask: Ask
         """
         if not self._asks.tick_exists(ask.order_id) and ask.order_id not in self.completed_orders and ask.is_valid():
-            self._asks.insert_tick(ask)
+            self._tick_by_id[ask.order_id] = self._asks.insert_tick(ask)
             delay = int(ask.timestamp) + int(ask.timeout) * 1000 - int(time.time() * 1000)
             self.register_task("ask_%s_timeout" % ask.order_id, self.timeout_ask, ask.order_id, delay=delay)
         else:
@@ -60,13 +61,14 @@ class OrderBook(TaskManager):
         if self._asks.tick_exists(order_id):
             self.cancel_pending_task("ask_%s_timeout" % order_id)
             self._asks.remove_tick(order_id)
+            self._tick_by_id.pop(order_id, None)
 
     def insert_bid(self, bid):
         """
         :type bid: Bid
         """
         if not self._bids.tick_exists(bid.order_id) and bid.order_id not in self.completed_orders and bid.is_valid():
-            self._bids.insert_tick(bid)
+            self._tick_by_id[bid.order_id] = self._bids.insert_tick(bid)
             delay = int(bid.timestamp) + int(bid.timeout) * 1000 - int(time.time() * 1000)
             self.register_task("bid_%s_timeout" % bid.order_id, self.timeout_bid, bid.order_id, delay=delay)
         else:
@@ -79,6 +81,7 @@ class OrderBook(TaskManager):
         if self._bids.tick_exists(order_id):
             self.cancel_pending_task("bid_%s_timeout" % order_id)
             self._bids.remove_tick(order_id)
+            self._tick_by_id.pop(order_id, None)
 
     def update_ticks(self, ask_order_dict, bid_order_dict, traded_quantity):
         """
@@ -137,10 +140,7 @@ class OrderBook(TaskManager):
         :return: True if the tick exists, False otherwise
         :rtype: bool
         """
-        is_ask = self._asks.tick_exists(order_id)
-        is_bid = self._bids.tick_exists(order_id)
-
-        return is_ask or is_bid
+        return order_id in self._tick_by_id
 
     def get_ask(self, order_id):
         """
@@ -165,7 +165,7 @@ class OrderBook(TaskManager):
         :type order_id: OrderId
         :rtype: TickEntry
         """
-        return self._bids.get_tick(order_id) or self._asks.get_tick(order_id)
+        return self._tick_by_id.get(order_id)
 
     def ask_exists(self, order_id):
         """
@@ -263,7 +263,7 @@ class OrderBook(TaskManager):
         :rtype: list
         """
         profile = []
-        for price_level in self._bids.get_price_level_list(price_wallet_id, quantity_wallet_id).items():
+        for price_level in self._bids.get_price_level_list(price_wallet_id, quantity_wallet_id).items_iter():
             profile.append((price_level.price, price_level.depth))
         return profile
 
@@ -275,7 +275,7 @@ class OrderBook(TaskManager):
         :rtype: list
         """
         profile = []
-        for price_level in self._asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items():
+        for price_level in self._asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items_iter():
             profile.append((price_level.price, price_level.depth))
         return profile
 
@@ -305,7 +305,7 @@ class OrderBook(TaskManager):
         ids = []
 
         for price_wallet_id, quantity_wallet_id in self.asks.get_price_level_list_wallets():
-            for price_level in self.asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items():
+            for price_level in self.asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items_iter():
                 for ask in price_level:
                     ids.append(ask.tick.order_id)
 
@@ -315,7 +315,7 @@ class OrderBook(TaskManager):
         ids = []
 
         for price_wallet_id, quantity_wallet_id in self.bids.get_price_level_list_wallets():
-            for price_level in self.bids.get_price_level_list(price_wallet_id, quantity_wallet_id).items():
+            for price_level in self.bids.get_price_level_list(price_wallet_id, quantity_wallet_id).items_iter():
                 for bid in price_level:
                     ids.append(bid.tick.order_id)
 
@@ -325,11 +325,12 @@ class OrderBook(TaskManager):
         res_str = ''
         res_str += "------ Bids -------\n"
         for price_wallet_id, quantity_wallet_id in self.bids.get_price_level_list_wallets():
-            for price_level in self._bids.get_price_level_list(price_wallet_id, quantity_wallet_id).items(reverse=True):
+            price_level_list = self._bids.get_price_level_list(price_wallet_id, quantity_wallet_id)
+            for price_level in price_level_list.items_iter(reverse=True):
                 res_str += '%s' % price_level
         res_str += "\n------ Asks -------\n"
         for price_wallet_id, quantity_wallet_id in self.asks.get_price_level_list_wallets():
-            for price_level in self._asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items():
+            for price_level in self._asks.get_price_level_list(price_wallet_id, quantity_wallet_id).items_iter():
                 res_str += '%s' % price_level
         res_str += "\n"
         return res_str
@@ -355,15 +356,17 @@ class DatabaseOrderBook(OrderBook):
         Write all ticks to the database
         """
         self.database.delete_all_ticks()
+        now = int(time.time() * 1000)
         for order_id in self.get_order_ids():
             tick = self.get_tick(order_id)
-            if tick.is_valid():
+            if tick.is_valid(now):
                 self.database.add_tick(tick.tick)
 
     def restore_from_database(self):
         """
         Restore ticks from the database
         """
+        now = int(time.time() * 1000)
         for tick in self.database.get_ticks():
-            if not self.tick_exists(tick.order_id) and tick.is_valid():
+            if not self.tick_exists(tick.order_id) and tick.is_valid(now):
                 self.insert_ask(tick) if tick.is_ask() else self.insert_bid(tick)
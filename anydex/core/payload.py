@@ -1,3 +1,5 @@
+import struct
+
 from ipv8.messaging.payload import Payload
 
 from anydex.core.assetamount import AssetAmount
@@ -9,12 +11,71 @@ from anydex.core.timeout import Timeout
 from anydex.core.timestamp import Timestamp
 
 
+# Precompiled structs, matching the big-endian formats used by the ipv8 serializer
+_UINT32 = struct.Struct('>I')
+_UINT64 = struct.Struct('>Q')
+_VARLEN_LENGTH = _UINT32
+_ORDER_HEAD = struct.Struct('>QIQ')  # Timestamp, order number, first asset amount
+_ORDER_TAIL = struct.Struct('>IQ')  # Timeout, traded quantity
+_NUMBERED_HEAD = struct.Struct('>QI')  # Timestamp, order number or request identifier
+_DECLINE_MATCH_TAIL = struct.Struct('>II')  # Other order number, decline reason
+_TRADE_MIDDLE = struct.Struct('>IIQ')  # Recipient order number, proposal id, first asset amount
+_DECLINE_TRADE_TAIL = struct.Struct('>III')  # Recipient order number, proposal id, decline reason
+
+_encoded_asset_ids = {}  # The UTF-8 encoding of the asset ids we send, there are usually only a handful of them
+_MAX_ENCODED_ASSET_IDS = 1024  # Asset ids can originate from other peers, so bound the cache
+
+
+def _pack_varlen(data):
+    """
+    Pack a bytes field the way the ipv8 serializer packs a 'varlenI' field.
+    """
+    return _VARLEN_LENGTH.pack(len(data)) + data
+
+
+def _build_packing_plan(format_list):
+    """
+    Split a format list into runs of fixed-width fields and varlen fields.
+    :return: a list of (struct, number of fields) tuples, where the struct is None for a varlen field
+    """
+    plan = []
+    run = []
+    for fmt in format_list:
+        if fmt == 'varlenI':
+            if run:
+                plan.append((struct.Struct('>' + ''.join(run)), len(run)))
+                run = []
+            plan.append((None, 1))
+        else:
+            run.append(fmt)
+    if run:
+        plan.append((struct.Struct('>' + ''.join(run)), len(run)))
+    return plan
+
+
+def _encode_asset_id(asset_id):
+    """
+    Return the UTF-8 encoding of an asset id, encoding each asset id only once.
+    """
+    encoded = _encoded_asset_ids.get(asset_id)
+    if encoded is None:
+        encoded = asset_id.encode('utf-8')
+        if len(_encoded_asset_ids) < _MAX_ENCODED_ASSET_IDS:
+            _encoded_asset_ids[asset_id] = encoded
+    return encoded
+
+
 class MessagePayload(Payload):
     """
     Payload for a generic message in the market community.
     """
 
     format_list = ['varlenI', 'Q']
+    _packing_plan = _build_packing_plan(format_list)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._packing_plan = _build_packing_plan(cls.format_list)
 
     def __init__(self, trader_id, timestamp):
         super(MessagePayload, self).__init__()
@@ -22,10 +83,23 @@ class MessagePayload(Payload):
         self.timestamp = timestamp
 
     def to_pack_list(self):
-        data = [('varlenI', bytes(self.trader_id)),
-                ('Q', int(self.timestamp))]
-
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp)]
+
+    def to_bytes(self):
+        """
+        Serialize this payload to the same bytes the ipv8 serializer produces for its pack list.
+        """
+        values = [value for _, value in self.to_pack_list()]
+        chunks = []
+        index = 0
+        for packer, count in self._packing_plan:
+            if packer is None:
+                chunks.append(_pack_varlen(values[index]))
+            else:
+                chunks.append(packer.pack(*values[index:index + count]))
+            index += count
+        return b''.join(chunks)
 
 
 class InfoPayload(MessagePayload):
@@ -40,13 +114,13 @@ class InfoPayload(MessagePayload):
         self.is_matchmaker = is_matchmaker
 
     def to_pack_list(self):
-        data = super(InfoPayload, self).to_pack_list()
-        data.append(('?', self.is_matchmaker))
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('?', self.is_matchmaker)]
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, is_matchmaker):
-        return InfoPayload(TraderId(trader_id), timestamp, is_matchmaker)
+        return InfoPayload(TraderId.get(trader_id), timestamp, is_matchmaker)
 
 
 class OrderPayload(MessagePayload):
@@ -64,15 +138,23 @@ class OrderPayload(MessagePayload):
         self.traded = traded
 
     def to_pack_list(self):
-        data = super(OrderPayload, self).to_pack_list()
-        data += [('I', int(self.order_number)),
-                 ('Q', self.assets.first.amount),
-                 ('varlenI', self.assets.first.asset_id.encode('utf-8')),
-                 ('Q', self.assets.second.amount),
-                 ('varlenI', self.assets.second.asset_id.encode('utf-8')),
-                 ('I', int(self.timeout)),
-                 ('Q', self.traded)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('Q', self.assets.first.amount),
+                ('varlenI', _encode_asset_id(self.assets.first.asset_id)),
+                ('Q', self.assets.second.amount),
+                ('varlenI', _encode_asset_id(self.assets.second.asset_id)),
+                ('I', self.timeout),
+                ('Q', self.traded)]
+
+    def to_bytes(self):
+        return b''.join((_pack_varlen(self.trader_id.trader_id),
+                         _ORDER_HEAD.pack(self.timestamp, self.order_number, self.assets.first.amount),
+                         _pack_varlen(_encode_asset_id(self.assets.first.asset_id)),
+                         _UINT64.pack(self.assets.second.amount),
+                         _pack_varlen(_encode_asset_id(self.assets.second.asset_id)),
+                         _ORDER_TAIL.pack(self.timeout, self.traded)))
 
 
 class MatchPayload(OrderPayload):
@@ -90,20 +172,33 @@ class MatchPayload(OrderPayload):
         self.matchmaker_trader_id = matchmaker_trader_id
 
     def to_pack_list(self):
-        data = super(MatchPayload, self).to_pack_list()
-        data += [('I', int(self.recipient_order_number)),
-                 ('varlenI', bytes(self.match_trader_id)),
-                 ('varlenI', bytes(self.matchmaker_trader_id))]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('Q', self.assets.first.amount),
+                ('varlenI', _encode_asset_id(self.assets.first.asset_id)),
+                ('Q', self.assets.second.amount),
+                ('varlenI', _encode_asset_id(self.assets.second.asset_id)),
+                ('I', self.timeout),
+                ('Q', self.traded),
+                ('I', self.recipient_order_number),
+                ('varlenI', bytes(self.match_trader_id)),
+                ('varlenI', bytes(self.matchmaker_trader_id))]
+
+    def to_bytes(self):
+        return b''.join((super(MatchPayload, self).to_bytes(),
+                         _UINT32.pack(self.recipient_order_number),
+                         _pack_varlen(self.match_trader_id.trader_id),
+                         _pack_varlen(self.matchmaker_trader_id.trader_id)))
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_number, asset1_amount, asset1_type, asset2_amount,
                          asset2_type, timeout, traded, recipient_order_number, match_trader_id, matchmaker_trader_id):
-        return MatchPayload(TraderId(trader_id), Timestamp(timestamp), OrderNumber(order_number),
+        return MatchPayload(TraderId.get(trader_id), Timestamp(timestamp), OrderNumber.get(order_number),
                             AssetPair(AssetAmount(asset1_amount, asset1_type.decode('utf-8')),
                                       AssetAmount(asset2_amount, asset2_type.decode('utf-8'))),
-                            Timeout(timeout), traded, OrderNumber(recipient_order_number),
-                            TraderId(match_trader_id), TraderId(matchmaker_trader_id))
+                            Timeout(timeout), traded, OrderNumber.get(recipient_order_number),
+                            TraderId.get(match_trader_id), TraderId.get(matchmaker_trader_id))
 
 
 class DeclineMatchPayload(MessagePayload):
@@ -120,17 +215,24 @@ class DeclineMatchPayload(MessagePayload):
         self.decline_reason = decline_reason
 
     def to_pack_list(self):
-        data = super(DeclineMatchPayload, self).to_pack_list()
-        data += [('I', int(self.order_number)),
-                 ('varlenI', bytes(self.other_order_id.trader_id)),
-                 ('I', int(self.other_order_id.order_number)),
-                 ('I', self.decline_reason)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('varlenI', bytes(self.other_order_id.trader_id)),
+                ('I', self.other_order_id.order_number),
+                ('I', self.decline_reason)]
+
+    def to_bytes(self):
+        return b''.join((_pack_varlen(self.trader_id.trader_id),
+                         _NUMBERED_HEAD.pack(self.timestamp, self.order_number),
+                         _pack_varlen(self.other_order_id.trader_id.trader_id),
+                         _DECLINE_MATCH_TAIL.pack(self.other_order_id.order_number, self.decline_reason)))
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_number, other_trader_id, other_order_number, decline_reason):
-        return DeclineMatchPayload(TraderId(trader_id), Timestamp(timestamp), OrderNumber(order_number),
-                                   OrderId(TraderId(other_trader_id), OrderNumber(other_order_number)), decline_reason)
+        return DeclineMatchPayload(TraderId.get(trader_id), timestamp, OrderNumber.get(order_number),
+                                   OrderId(TraderId.get(other_trader_id), OrderNumber.get(other_order_number)),
+                                   decline_reason)
 
 
 class TradePayload(MessagePayload):
@@ -148,22 +250,33 @@ class TradePayload(MessagePayload):
         self.assets = assets
 
     def to_pack_list(self):
-        data = super(TradePayload, self).to_pack_list()
-        data += [('I', int(self.order_number)),
-                 ('varlenI', bytes(self.recipient_order_id.trader_id)),
-                 ('I', int(self.recipient_order_id.order_number)),
-                 ('I', self.proposal_id),
-                 ('Q', self.assets.first.amount),
-                 ('varlenI', self.assets.first.asset_id.encode('utf-8')),
-                 ('Q', self.assets.second.amount),
-                 ('varlenI', self.assets.second.asset_id.encode('utf-8'))]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('varlenI', bytes(self.recipient_order_id.trader_id)),
+                ('I', self.recipient_order_id.order_number),
+                ('I', self.proposal_id),
+                ('Q', self.assets.first.amount),
+                ('varlenI', _encode_asset_id(self.assets.first.asset_id)),
+                ('Q', self.assets.second.amount),
+                ('varlenI', _encode_asset_id(self.assets.second.asset_id))]
+
+    def to_bytes(self):
+        return b''.join((_pack_varlen(self.trader_id.trader_id),
+                         _NUMBERED_HEAD.pack(self.timestamp, self.order_number),
+                         _pack_varlen(self.recipient_order_id.trader_id.trader_id),
+                         _TRADE_MIDDLE.pack(self.recipient_order_id.order_number, self.proposal_id,
+                                            self.assets.first.amount),
+                         _pack_varlen(_encode_asset_id(self.assets.first.asset_id)),
+                         _UINT64.pack(self.assets.second.amount),
+                         _pack_varlen(_encode_asset_id(self.assets.second.asset_id))))
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_number, recipient_trader_id, recipient_order_number,
                          proposal_id, asset1_amount, asset1_type, asset2_amount, asset2_type):
-        return TradePayload(TraderId(trader_id), Timestamp(timestamp), OrderNumber(order_number),
-                            OrderId(TraderId(recipient_trader_id), OrderNumber(recipient_order_number)), proposal_id,
+        return TradePayload(TraderId.get(trader_id), Timestamp(timestamp), OrderNumber.get(order_number),
+                            OrderId(TraderId.get(recipient_trader_id), OrderNumber.get(recipient_order_number)),
+                            proposal_id,
                             AssetPair(AssetAmount(asset1_amount, asset1_type.decode('utf-8')),
                                       AssetAmount(asset2_amount, asset2_type.decode('utf-8'))))
 
@@ -180,19 +293,26 @@ class DeclineTradePayload(MessagePayload):
         self.decline_reason = decline_reason
 
     def to_pack_list(self):
-        data = super(DeclineTradePayload, self).to_pack_list()
-        data += [('I', int(self.order_number)),
-                 ('varlenI', bytes(self.recipient_order_id.trader_id)),
-                 ('I', int(self.recipient_order_id.order_number)),
-                 ('I', self.proposal_id),
-                 ('I', self.decline_reason)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('varlenI', bytes(self.recipient_order_id.trader_id)),
+                ('I', self.recipient_order_id.order_number),
+                ('I', self.proposal_id),
+                ('I', self.decline_reason)]
+
+    def to_bytes(self):
+        return b''.join((_pack_varlen(self.trader_id.trader_id),
+                         _NUMBERED_HEAD.pack(self.timestamp, self.order_number),
+                         _pack_varlen(self.recipient_order_id.trader_id.trader_id),
+                         _DECLINE_TRADE_TAIL.pack(self.recipient_order_id.order_number, self.proposal_id,
+                                                  self.decline_reason)))
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_number, recipient_trader_id,
                          recipient_order_number, proposal_id, decline_reason):
-        return DeclineTradePayload(TraderId(trader_id), Timestamp(timestamp), OrderNumber(order_number),
-                                   OrderId(TraderId(recipient_trader_id), OrderNumber(recipient_order_number)),
+        return DeclineTradePayload(TraderId.get(trader_id), Timestamp(timestamp), OrderNumber.get(order_number),
+                                   OrderId(TraderId.get(recipient_trader_id), OrderNumber.get(recipient_order_number)),
                                    proposal_id, decline_reason)
 
 
@@ -208,9 +328,9 @@ class TransactionPayload(MessagePayload):
         self.transaction_id = transaction_id
 
     def to_pack_list(self):
-        data = super(TransactionPayload, self).to_pack_list()
-        data += [('32s', bytes(self.transaction_id))]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('32s', bytes(self.transaction_id))]
 
 
 class OrderStatusRequestPayload(MessagePayload):
@@ -226,16 +346,17 @@ class OrderStatusRequestPayload(MessagePayload):
         self.identifier = identifier
 
     def to_pack_list(self):
-        data = super(OrderStatusRequestPayload, self).to_pack_list()
-        data += [('varlenI', bytes(self.order_id.trader_id)),
-                 ('I', int(self.order_id.order_number)),
-                 ('I', self.identifier)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('varlenI', bytes(self.order_id.trader_id)),
+                ('I', self.order_id.order_number),
+                ('I', self.identifier)]
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_trader_id, order_number, identifier):
-        return OrderStatusRequestPayload(TraderId(trader_id), Timestamp(timestamp),
-                                         OrderId(TraderId(order_trader_id), OrderNumber(order_number)), identifier)
+        return OrderStatusRequestPayload(TraderId.get(trader_id), timestamp,
+                                         OrderId(TraderId.get(order_trader_id), OrderNumber.get(order_number)),
+                                         identifier)
 
 
 class OrderStatusResponsePayload(OrderPayload):
@@ -250,17 +371,27 @@ class OrderStatusResponsePayload(OrderPayload):
         self.identifier = identifier
 
     def to_pack_list(self):
-        data = super(OrderStatusResponsePayload, self).to_pack_list()
-        data += [('I', self.identifier)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.order_number),
+                ('Q', self.assets.first.amount),
+                ('varlenI', _encode_asset_id(self.assets.first.asset_id)),
+                ('Q', self.assets.second.amount),
+                ('varlenI', _encode_asset_id(self.assets.second.asset_id)),
+                ('I', self.timeout),
+                ('Q', self.traded),
+                ('I', self.identifier)]
+
+    def to_bytes(self):
+        return super(OrderStatusResponsePayload, self).to_bytes() + _UINT32.pack(self.identifier)
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, order_number, asset1_amount, asset1_type, asset2_amount,
                          asset2_type, timeout, traded, identifier):
-        return OrderStatusResponsePayload(TraderId(trader_id), Timestamp(timestamp), OrderNumber(order_number),
+        return OrderStatusResponsePayload(TraderId.get(trader_id), timestamp, OrderNumber.get(order_number),
                                           AssetPair(AssetAmount(asset1_amount, asset1_type.decode('utf-8')),
                                                     AssetAmount(asset2_amount, asset2_type.decode('utf-8'))),
-                                          Timeout(timeout), traded, identifier)
+                                          timeout, traded, identifier)
 
 
 class OrderbookSyncPayload(MessagePayload):
@@ -275,55 +406,49 @@ class OrderbookSyncPayload(MessagePayload):
         self.bloomfilter = bloomfilter
 
     def to_pack_list(self):
-        data = super(OrderbookSyncPayload, self).to_pack_list()
-        data += [('B', self.bloomfilter.functions),
-                 ('c', self.bloomfilter.prefix),
-                 ('varlenI', self.bloomfilter.bytes)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('B', self.bloomfilter.functions),
+                ('c', self.bloomfilter.prefix),
+                ('varlenI', self.bloomfilter.bytes)]
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, bf_functions, bf_prefix, bf_bytes):
         bloomfilter = BloomFilter(bf_bytes, bf_functions, prefix=bf_prefix)
-        return OrderbookSyncPayload(TraderId(trader_id), timestamp, bloomfilter)
+        return OrderbookSyncPayload(TraderId.get(trader_id), timestamp, bloomfilter)
 
 
-class PingPongPayload(MessagePayload):
+class IdentifierPayload(MessagePayload):
     """
-    Payload for a ping and pong message in the market community.
+    Payload for a message in the market community that carries a request identifier.
     """
 
     format_list = MessagePayload.format_list + ['I']
 
     def __init__(self, trader_id, timestamp, identifier):
-        super(PingPongPayload, self).__init__(trader_id, timestamp)
+        super(IdentifierPayload, self).__init__(trader_id, timestamp)
         self.identifier = identifier
 
     def to_pack_list(self):
-        data = super(PingPongPayload, self).to_pack_list()
-        data += [('I', self.identifier)]
-        return data
+        return [('varlenI', bytes(self.trader_id)),
+                ('Q', self.timestamp),
+                ('I', self.identifier)]
+
+    def to_bytes(self):
+        return _pack_varlen(self.trader_id.trader_id) + _NUMBERED_HEAD.pack(self.timestamp, self.identifier)
 
     @classmethod
     def from_unpack_list(cls, trader_id, timestamp, identifier):
-        return PingPongPayload(TraderId(trader_id), timestamp, identifier)
+        return cls(TraderId.get(trader_id), timestamp, identifier)
 
 
-class PublicKeyPayload(MessagePayload):
+class PingPongPayload(IdentifierPayload):
     """
-    Payload for a request/response message to fetch the public key from another peer.
+    Payload for a ping and pong message in the market community.
     """
 
-    format_list = MessagePayload.format_list + ['I']
-
-    def __init__(self, trader_id, timestamp, identifier):
-        super(PublicKeyPayload, self).__init__(trader_id, timestamp)
-        self.identifier = identifier
 
-    def to_pack_list(self):
-        data = super(PublicKeyPayload, self).to_pack_list()
-        data.append(('I', self.identifier))
-        return data
-
-    @classmethod
-    def from_unpack_list(cls, trader_id, timestamp, identifier):
-        return PublicKeyPayload(TraderId(trader_id), timestamp, identifier)
+class PublicKeyPayload(IdentifierPayload):
+    """
+    Payload for a request/response message to fetch the public key from another peer.
+    """
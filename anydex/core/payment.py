@@ -1,3 +1,4 @@
+import sys
 from binascii import unhexlify
 
 from anydex.core.assetamount import AssetAmount
@@ -11,6 +12,8 @@ from anydex.core.wallet_address import WalletAddress
 class Payment(Message):
     """Class representing a payment."""
 
+    __slots__ = ('_transaction_id', '_transferred_assets', '_address_from', '_address_to', '_payment_id')
+
     def __init__(self, trader_id, transaction_id, transferred_assets, address_from, address_to, payment_id,
                  timestamp):
         super(Payment, self).__init__(trader_id, timestamp)
@@ -28,8 +31,9 @@ class Payment(Message):
         (trader_id, transaction_id, payment_id, transferred_amount, transferred_id,
          address_from, address_to, timestamp) = data
 
-        transaction_id = TransactionId(bytes(transaction_id))
-        return cls(TraderId(bytes(trader_id)), transaction_id, AssetAmount(transferred_amount, transferred_id.decode()),
+        transaction_id = TransactionId(transaction_id)
+        transferred_assets = AssetAmount(transferred_amount, sys.intern(transferred_id.decode()))
+        return cls(TraderId.get(trader_id), transaction_id, transferred_assets,
                    WalletAddress(str(address_from)), WalletAddress(str(address_to)), PaymentId(str(payment_id)),
                    Timestamp(timestamp))
 
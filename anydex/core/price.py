@@ -1,4 +1,7 @@
 from fractions import Fraction
+from math import gcd
+
+_market_keys = {}  # A small integer for every (num_type, denom_type) pair, so prices can compare their markets cheaply
 
 
 class Price(object):
@@ -8,51 +11,75 @@ class Price(object):
     For instance, 0.5 MB/BTC means that one exchanges 0.5 MB for 1 BTC.
     """
 
+    __slots__ = ('num', 'denom', 'num_type', 'denom_type', 'amount', '_num', '_denom', '_hash', '_market')
+
     def __init__(self, num, denom, num_type, denom_type):
         self.num = num
         self.denom = denom
         self.num_type = num_type
         self.denom_type = denom_type
-        self.frac = Fraction(num, denom)
-        self.amount = float(self.frac)
+        if denom == 0:
+            raise ZeroDivisionError('Price(%s, 0)' % num)
+        # The reduced numerator and denominator, with the sign on the numerator, used for exact comparisons by
+        # cross-multiplication
+        divisor = gcd(num, denom)
+        if denom < 0:
+            divisor = -divisor
+        self._num = num // divisor
+        self._denom = denom // divisor
+        self.amount = self._num / self._denom
+        self._hash = hash((self._num, self._denom, num_type, denom_type))
+        market = (num_type, denom_type)
+        market_key = _market_keys.get(market)
+        if market_key is None:
+            market_key = _market_keys[market] = len(_market_keys)
+        self._market = market_key
+
+    @property
+    def frac(self):
+        """
+        Return this price as an exact fraction.
+        :rtype: Fraction
+        """
+        return Fraction(self._num, self._denom)
 
     def __str__(self):
         return "%g %s/%s" % (self.amount, self.num_type, self.denom_type)
 
     def __lt__(self, other):
-        if isinstance(other, Price) and self.num_type == other.num_type and self.denom_type == other.denom_type:
-            return self.amount < other.amount
+        if type(other) is Price and self._market == other._market:
+            return self._num * other._denom < other._num * self._denom
         else:
             return NotImplemented
 
     def __le__(self, other):
-        if isinstance(other, Price) and self.num_type == other.num_type and self.denom_type == other.denom_type:
-            return self.amount <= other.amount
+        if type(other) is Price and self._market == other._market:
+            return self._num * other._denom <= other._num * self._denom
         else:
             return NotImplemented
 
     def __ne__(self, other):
-        if not isinstance(other, Price) or self.num_type != other.num_type or self.denom_type != other.denom_type:
+        if type(other) is not Price or self._market != other._market:
             return NotImplemented
-        return not self.__eq__(other)
+        return self._num != other._num or self._denom != other._denom
 
     def __gt__(self, other):
-        if isinstance(other, Price) and self.num_type == other.num_type and self.denom_type == other.denom_type:
-            return self.amount > other.amount
+        if type(other) is Price and self._market == other._market:
+            return self._num * other._denom > other._num * self._denom
         else:
             return NotImplemented
 
     def __ge__(self, other):
-        if isinstance(other, Price) and self.num_type == other.num_type and self.denom_type == other.denom_type:
-            return self.amount >= other.amount
+        if type(other) is Price and self._market == other._market:
+            return self._num * other._denom >= other._num * self._denom
         else:
             return NotImplemented
 
     def __eq__(self, other):
-        if not isinstance(other, Price) or self.num_type != other.num_type or self.denom_type != other.denom_type:
+        if type(other) is not Price or self._market != other._market:
             return NotImplemented
         else:
-            return self.frac == other.frac
+            return self._num == other._num and self._denom == other._denom
 
     def __hash__(self):
-        return hash((hash(self.frac), self.num_type, self.denom_type))
+        return self._hash
@@ -8,6 +8,8 @@ class PriceLevel(object):
         self._depth = 0  # Total amount of quantity contained in this price level
         self._last = None  # The current tick of the iterator
         self._price = price  # The price of this price level
+        self._prev_level = None  # The price level with the next lower price, maintained by the PriceLevelList
+        self._next_level = None  # The price level with the next higher price, maintained by the PriceLevelList
 
     @property
     def price(self):
@@ -23,6 +25,36 @@ class PriceLevel(object):
         """
         return self._head_tick
 
+    @property
+    def prev_level(self):
+        """
+        :rtype: PriceLevel
+        """
+        return self._prev_level
+
+    @prev_level.setter
+    def prev_level(self, new_prev_level):
+        """
+        :param new_prev_level: The new previous price level
+        :type new_prev_level: PriceLevel
+        """
+        self._prev_level = new_prev_level
+
+    @property
+    def next_level(self):
+        """
+        :rtype: PriceLevel
+        """
+        return self._next_level
+
+    @next_level.setter
+    def next_level(self, new_next_level):
+        """
+        :param new_next_level: The new next price level
+        :type new_next_level: PriceLevel
+        """
+        self._next_level = new_next_level
+
     @property
     def length(self):
         """
@@ -1,4 +1,6 @@
-from typing import Any, Dict, List  # pylint: disable=unused-import
+from typing import Any, Iterator, List  # pylint: disable=unused-import
+
+from sortedcontainers import SortedDict
 
 from anydex.core.price import Price  # pylint: disable=unused-import
 from anydex.core.pricelevel import PriceLevel
@@ -6,28 +8,48 @@ from anydex.core.pricelevel import PriceLevel
 
 class PriceLevelList(object):
     """
-    Sorted doubly linked dictionary implementation.
+    Sorted dictionary of price levels, keyed on their price.
     """
 
     def __init__(self):
         super(PriceLevelList, self).__init__()
-        self._price_list = []  # type: List[float]
-        self._price_level_dictionary = {}  # type: Dict[float, PriceLevel]
+        self._price_levels = SortedDict()  # type: SortedDict[Price, PriceLevel]
 
     def insert(self, price_level):  # type: (PriceLevel) -> None
         """
         :type price_level: PriceLevel
         """
-        self._price_list.append(price_level.price)
-        self._price_list.sort()
-        self._price_level_dictionary[price_level.price] = price_level
+        price_levels = self._price_levels
+        price_levels[price_level.price] = price_level
+
+        # Link the new price level to its neighbours, so succ_item and prev_item do not have to search for them
+        index = price_levels.index(price_level.price)
+        prev_level = price_levels.peekitem(index - 1)[1] if index > 0 else None
+        next_level = price_levels.peekitem(index + 1)[1] if index + 1 < len(price_levels) else None
+        price_level.prev_level = prev_level
+        price_level.next_level = next_level
+        if prev_level is not None:
+            prev_level.next_level = price_level
+        if next_level is not None:
+            next_level.prev_level = price_level
 
     def remove(self, price):  # type: (Price) -> None
         """
         :type price: Price
+        :raises ValueError: Thrown when there is no price level with the given price
         """
-        self._price_list.remove(price)
-        del self._price_level_dictionary[price]
+        price_level = self._price_levels.pop(price, None)
+        if price_level is None:
+            raise ValueError("No price level with price %s" % price)
+
+        prev_level = price_level.prev_level
+        next_level = price_level.next_level
+        if prev_level is not None:
+            prev_level.next_level = next_level
+        if next_level is not None:
+            next_level.prev_level = prev_level
+        price_level.prev_level = None
+        price_level.next_level = None
 
     def succ_item(self, price):  # type: (Price) -> PriceLevel
         """
@@ -36,11 +58,10 @@ class PriceLevelList(object):
         :type price: Price
         :rtype: PriceLevel
         """
-        index = self._price_list.index(price) + 1
-        if index >= len(self._price_list):
+        next_level = self._price_levels[price].next_level
+        if next_level is None:
             raise IndexError
-        succ_price = self._price_list[index]
-        return self._price_level_dictionary[succ_price]
+        return next_level
 
     def prev_item(self, price):  # type: (Price) -> PriceLevel
         """
@@ -49,11 +70,10 @@ class PriceLevelList(object):
         :type price: Price
         :rtype: PriceLevel
         """
-        index = self._price_list.index(price) - 1
-        if index < 0:
+        prev_level = self._price_levels[price].prev_level
+        if prev_level is None:
             raise IndexError
-        prev_price = self._price_list[index]
-        return self._price_level_dictionary[prev_price]
+        return prev_level
 
     def min_key(self):  # type: () -> Price
         """
@@ -61,7 +81,7 @@ class PriceLevelList(object):
 
         :rtype: Price
         """
-        return self._price_list[0]
+        return self._price_levels.peekitem(0)[0]
 
     def max_key(self):  # type: () -> Price
         """
@@ -69,23 +89,32 @@ class PriceLevelList(object):
 
         :rtype: Price
         """
-        return self._price_list[-1]
+        return self._price_levels.peekitem(-1)[0]
 
-    def items(self, reverse=False):  # type: (bool) -> List[(Price, PriceLevel)]
+    def items(self, reverse=False):  # type: (bool) -> List[PriceLevel]
         """
         Returns a sorted list (on price) of price_levels
 
-        :param reverse: When true returns the reversed sorted list of price, price_level tuples
+        :param reverse: When true returns the reversed sorted list of price levels
+        :type reverse: bool
+        :rtype: List[PriceLevel]
+        """
+        if reverse:
+            return list(reversed(self._price_levels.values()))
+        return list(self._price_levels.values())
+
+    def items_iter(self, reverse=False):  # type: (bool) -> Iterator[PriceLevel]
+        """
+        Returns an iterator over the price levels, sorted on price, without copying them into a list first.
+        The price level list should not be changed while iterating.
+
+        :param reverse: When true iterates over the price levels in reversed order
         :type reverse: bool
-        :rtype: List[(Price, PriceLevel)]
+        :rtype: Iterator[PriceLevel]
         """
-        items = []
-        for price in self._price_list:
-            if reverse:
-                items.insert(0, self._price_level_dictionary[price])
-            else:
-                items.append(self._price_level_dictionary[price])
-        return items
+        if reverse:
+            return reversed(self._price_levels.values())
+        return iter(self._price_levels.values())
 
     def get_ticks_list(self):  # type: () -> List[Any]
         """
@@ -93,8 +122,9 @@ class PriceLevelList(object):
         :return: list
         """
         ticks_list = []
-        for price_level in self.items():
+        append = ticks_list.append
+        for price_level in self._price_levels.values():
             for tick in price_level:
-                ticks_list.append(tick.tick.to_dictionary())
+                append(tick.tick.to_dictionary())
 
         return ticks_list
@@ -11,3 +11,5 @@ class MarketSettings(object):
         self.max_concurrent_trades = 0  # How many concurrent trades with risky counterparties we allow, 0 = unlimited
         self.transfers_per_trade = 1    # How many transfers each side should do when trading, defaults to 1
         self.match_process_batch_size = 20  # How many match items we process in one batch
+        self.max_sent_matches = 100000  # How many sent match messages we remember to avoid sending duplicates
+        self.match_done_history_size = 4096  # How many transaction-completed messages we remember to drop duplicates
@@ -80,6 +80,8 @@ class Side(object):
         """
         :param tick: The tick to insert
         :type tick: Tick
+        :return: The tick entry of the inserted tick
+        :rtype: TickEntry
         """
         if (tick.assets.second.asset_id, tick.assets.first.asset_id) not in self._price_level_list_map:
             self._price_level_list_map[(tick.assets.second.asset_id, tick.assets.first.asset_id)] = PriceLevelList()
@@ -90,6 +92,7 @@ class Side(object):
         tick_entry = TickEntry(tick, self._price_map[tick.price])
         self.get_price_level(tick.price).append_tick(tick_entry)
         self._tick_map[tick.order_id] = tick_entry
+        return tick_entry
 
     def remove_tick(self, order_id):
         """
@@ -160,13 +163,19 @@ class Side(object):
             return self.get_price_level(self.get_min_price(price_wallet_id, quantity_wallet_id))
         return None
 
+    def iter_list_representation(self):
+        """
+        Yield the descriptions of the ticks in this side one market at a time, so each market can be processed
+        before the next one is built. The side may change in between two markets.
+        :rtype: Iterator[dict]
+        """
+        for asset1, asset2 in list(self._price_level_list_map):
+            yield {'asset1': asset2, 'asset2': asset1,
+                   'ticks': self._price_level_list_map[(asset1, asset2)].get_ticks_list()}
+
     def get_list_representation(self):
         """
         Return a list describing all ticks in this side.
         :rtype: list
         """
-        rlist = []
-        for asset1, asset2 in self._price_level_list_map.keys():
-            rlist.append({'asset1': asset2, 'asset2': asset1,
-                          'ticks': self._price_level_list_map[(asset1, asset2)].get_ticks_list()})
-        return rlist
+        return list(self.iter_list_representation())
@@ -18,6 +18,9 @@ class Tick(object):
     """
     TIME_TOLERANCE = 10 * 1000  # A small tolerance for the timestamp, to account for network delays
 
+    __slots__ = ('_order_id', '_assets', '_timeout', '_timestamp', '_is_ask', '_traded', '_block_hash',
+                 '_valid_from', '_valid_until', '_dictionary')
+
     def __init__(self, order_id, assets, timeout, timestamp, is_ask, traded=0, block_hash=GENESIS_HASH):
         """
         Don't use this class directly, use one of the class methods
@@ -45,6 +48,12 @@ class Tick(object):
         self._traded = traded
         self._block_hash = block_hash
 
+        # The timestamp and timeout do not change, so the window in which this tick is valid is computed only once.
+        # A tick with a timeout above the maximum is never valid.
+        self._valid_from = int(timestamp) - self.TIME_TOLERANCE
+        self._valid_until = int(timestamp) + int(timeout) * 1000 if int(timeout) <= MAX_ORDER_TIMEOUT else 0
+        self._dictionary = None  # The dictionary representation of this tick, built on first use
+
     @classmethod
     def from_database(cls, data):
         trader_id, order_number, asset1_amount, asset1_type, asset2_amount, asset2_type, timeout, timestamp,\
@@ -135,6 +144,7 @@ class Tick(object):
         :type new_traded: int
         """
         self._traded = new_traded
+        self._dictionary = None
 
     @property
     def block_hash(self):
@@ -151,17 +161,19 @@ class Tick(object):
         :type new_hash: str
         """
         self._block_hash = new_hash
+        self._dictionary = None
 
-    def is_valid(self):
+    def is_valid(self, now=None):
         """
+        :param now: The current time in milliseconds, read from the clock when not given. Callers that check many
+                    ticks at once can read the clock once and pass it to each check.
+        :type now: int
         :return: True if valid, False otherwise
         :rtype: bool
         """
-        return (
-            not self._timeout.is_timed_out(self._timestamp)
-            and int(time.time() * 1000) >= int(self.timestamp) - self.TIME_TOLERANCE
-            and int(self._timeout) <= MAX_ORDER_TIMEOUT
-        )
+        if now is None:
+            now = int(time.time() * 1000)
+        return self._valid_from <= now < self._valid_until
 
     def to_network(self):
         """
@@ -192,16 +204,19 @@ class Tick(object):
     def to_dictionary(self):
         """
         Return a dictionary with a representation of this tick.
-        """
-        return {
-            "trader_id": self.order_id.trader_id.as_hex(),
-            "order_number": int(self.order_id.order_number),
-            "assets": self.assets.to_dictionary(),
-            "timeout": int(self.timeout),
-            "timestamp": int(self.timestamp),
-            "traded": self.traded,
-            "block_hash": hexlify(self.block_hash).decode('utf-8'),
-        }
+        The dictionary is cached until the traded quantity or block hash changes, so it should not be modified.
+        """
+        if self._dictionary is None:
+            self._dictionary = {
+                "trader_id": self.order_id.trader_id.as_hex(),
+                "order_number": int(self.order_id.order_number),
+                "assets": self.assets.to_dictionary(),
+                "timeout": int(self.timeout),
+                "timestamp": int(self.timestamp),
+                "traded": self.traded,
+                "block_hash": hexlify(self.block_hash).decode('utf-8'),
+            }
+        return self._dictionary
 
     def __str__(self):
         """
@@ -214,6 +229,8 @@ class Tick(object):
 class Ask(Tick):
     """Represents an ask from a order located on another node."""
 
+    __slots__ = ()
+
     def __init__(self, order_id, assets, timeout, timestamp, traded=0, block_hash=GENESIS_HASH):
         """
         :param order_id: A order id to identify the order this tick represents
@@ -254,6 +271,8 @@ class Ask(Tick):
 class Bid(Tick):
     """Represents a bid from a order located on another node."""
 
+    __slots__ = ()
+
     def __init__(self, order_id, assets, timeout, timestamp, traded=0, block_hash=GENESIS_HASH):
         """
         :param order_id: A order id to identify the order this tick represents
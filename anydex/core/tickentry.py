@@ -87,14 +87,16 @@ class TickEntry(TaskManager):
         """
         return order_id in self._blocked_for_matching
 
-    def is_valid(self):
+    def is_valid(self, now=None):
         """
         Return if the tick is still valid
 
+        :param now: The current time in milliseconds, read from the clock when not given
+        :type now: int
         :return: True if valid, False otherwise
         :rtype: bool
         """
-        return self._tick.is_valid()
+        return self._tick.is_valid(now)
 
     def price_level(self):
         """
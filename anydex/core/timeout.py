@@ -4,6 +4,8 @@ import time
 class Timeout(object):
     """Used for having a validated instance of a timeout that we can easily check if it still valid."""
 
+    __slots__ = ('_timeout',)
+
     def __init__(self, timeout):
         """
         :param timeout: Integer representation of a timeout
@@ -20,19 +22,26 @@ class Timeout(object):
 
         self._timeout = timeout
 
-    def is_timed_out(self, timestamp):
+    def is_timed_out(self, timestamp, now=None):
         """
         Return if a timeout has occurred
 
         :param timestamp: A timestamp
+        :param now: The current time in milliseconds, read from the clock when not given
         :type timestamp: Timestamp
+        :type now: int
         :return: True if timeout has occurred, False otherwise
         :rtype: bool
         """
-        return int(time.time() * 1000) - int(timestamp) >= self._timeout * 1000
+        if now is None:
+            now = int(time.time() * 1000)
+        return now - int(timestamp) >= self._timeout * 1000
 
     def __int__(self):
         return self._timeout
 
+    def __index__(self):
+        return self._timeout
+
     def __hash__(self):
         return hash(self._timeout)
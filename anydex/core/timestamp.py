@@ -34,6 +34,9 @@ class Timestamp(object):
     def __int__(self):
         return self._timestamp
 
+    def __index__(self):
+        return self._timestamp
+
     def __str__(self):
         return "%s" % datetime.datetime.fromtimestamp(self._timestamp // 1000)
 
@@ -1,4 +1,5 @@
 import logging
+import sys
 from binascii import hexlify, unhexlify
 
 from anydex.core.assetamount import AssetAmount
@@ -8,24 +9,30 @@ from anydex.core.order import OrderId, OrderNumber
 from anydex.core.timestamp import Timestamp
 from anydex.core.wallet_address import WalletAddress
 
+logger = logging.getLogger(__name__)
+
 
 class TransactionId(object):
     """Immutable class for representing the id of a transaction."""
 
+    __slots__ = ('transaction_id', '_hex')
+
     def __init__(self, transaction_id):
         """
         :param transaction_id: String representing the transaction id
         :type transaction_id: bytes
         :raises ValueError: Thrown when one of the arguments are invalid
         """
-        super(TransactionId, self).__init__()
-
-        transaction_id = transaction_id if isinstance(transaction_id, bytes) else bytes(transaction_id)
+        if type(transaction_id) is not bytes:
+            if not isinstance(transaction_id, (bytes, bytearray, memoryview)):
+                raise ValueError("Transaction ID must be bytes, found %s instead" % type(transaction_id))
+            transaction_id = bytes(transaction_id)
 
         if len(transaction_id) != 32:
             raise ValueError("Transaction ID must be 32 bytes")
 
         self.transaction_id = transaction_id  # type: bytes
+        self._hex = None  # The hex representation of the transaction id, computed on first use
 
     def __str__(self):
         return "%s" % self.transaction_id
@@ -34,10 +41,12 @@ class TransactionId(object):
         return self.transaction_id
 
     def as_hex(self):
-        return hexlify(bytes(self)).decode('utf-8')
+        if self._hex is None:
+            self._hex = hexlify(self.transaction_id).decode('utf-8')
+        return self._hex
 
     def __eq__(self, other):
-        return self.transaction_id == other.transaction_id
+        return isinstance(other, TransactionId) and self.transaction_id == other.transaction_id
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -49,29 +58,35 @@ class TransactionId(object):
 class Transaction(object):
     """Class for representing a transaction between two nodes"""
 
-    def __init__(self, transaction_id, assets, order_id, partner_order_id, timestamp):
+    __slots__ = ('_transaction_id', '_assets', '_transferred_assets', '_order_id', '_partner_order_id', '_timestamp',
+                 'incoming_address', 'outgoing_address', 'partner_incoming_address', 'partner_outgoing_address',
+                 'trading_peer', '_payments', '_current_payment', '_block_dictionary')
+
+    def __init__(self, transaction_id, assets, order_id, partner_order_id, timestamp, transferred_assets=None):
         """
         :param transaction_id: An transaction id to identify the order
         :param assets: The asset pair to exchange
         :param order_id: The id of your order for this transaction
         :param partner_order_id: The id of the order of the other party
-        :param timestamp: A timestamp when the transaction was created
+        :param timestamp: A timestamp when the transaction was created, or its number of milliseconds
+        :param transferred_assets: The assets transferred so far, nothing of either asset when not given
         :type transaction_id: TransactionId
         :type assets: AssetPair
         :type order_id: OrderId
         :type partner_order_id: OrderId
-        :type timestamp: Timestamp
+        :type timestamp: Timestamp or int
+        :type transferred_assets: AssetPair
         """
-        super(Transaction, self).__init__()
-        self._logger = logging.getLogger(self.__class__.__name__)
+        if transferred_assets is None:
+            transferred_assets = AssetPair(AssetAmount(0, assets.first.asset_id),
+                                           AssetAmount(0, assets.second.asset_id))
 
         self._transaction_id = transaction_id
         self._assets = assets
-        self._transferred_assets = AssetPair(AssetAmount(0, assets.first.asset_id),
-                                             AssetAmount(0, assets.second.asset_id))
+        self._transferred_assets = transferred_assets
         self._order_id = order_id
         self._partner_order_id = partner_order_id
-        self._timestamp = timestamp
+        self._timestamp = int(timestamp)  # Kept as a plain integer, since it is only ever used as one
 
         self.incoming_address = None
         self.outgoing_address = None
@@ -81,6 +96,7 @@ class Transaction(object):
 
         self._payments = []
         self._current_payment = 0
+        self._block_dictionary = None  # The fields of the block dictionary that never change, built on first use
 
     @classmethod
     def from_database(cls, data, payments):
@@ -92,16 +108,19 @@ class Transaction(object):
          transaction_timestamp, incoming_address, outgoing_address,
          partner_incoming_address, partner_outgoing_address) = data
 
-        transaction_id = TransactionId(bytes(transaction_id))
+        # Asset types repeat across many rows, so every row shares the same string objects
+        asset1_type = sys.intern(asset1_type.decode())
+        asset2_type = sys.intern(asset2_type.decode())
+        transaction_id = TransactionId(transaction_id)
         transaction = cls(transaction_id,
-                          AssetPair(AssetAmount(asset1_amount, asset1_type.decode()),
-                                    AssetAmount(asset2_amount, asset2_type.decode())),
-                          OrderId(TraderId(bytes(trader_id)), OrderNumber(order_number)),
-                          OrderId(TraderId(bytes(partner_trader_id)), OrderNumber(partner_order_number)),
-                          Timestamp(transaction_timestamp))
-
-        transaction._transferred_assets = AssetPair(AssetAmount(asset1_transferred, asset1_type.decode()),
-                                                    AssetAmount(asset2_transferred, asset2_type.decode()))
+                          AssetPair(AssetAmount.get(asset1_amount, asset1_type),
+                                    AssetAmount.get(asset2_amount, asset2_type)),
+                          OrderId(TraderId.get(trader_id), OrderNumber.get(order_number)),
+                          OrderId(TraderId.get(partner_trader_id), OrderNumber.get(partner_order_number)),
+                          transaction_timestamp,
+                          transferred_assets=AssetPair(AssetAmount.get(asset1_transferred, asset1_type),
+                                                       AssetAmount.get(asset2_transferred, asset2_type)))
+
         transaction.incoming_address = WalletAddress(str(incoming_address))
         transaction.outgoing_address = WalletAddress(str(outgoing_address))
         transaction.partner_incoming_address = WalletAddress(str(partner_incoming_address))
@@ -115,12 +134,16 @@ class Transaction(object):
         Returns a database representation of a Transaction object.
         :rtype: tuple
         """
-        return (bytes(self.order_id.trader_id), bytes(self.transaction_id),
-                int(self.order_id.order_number),
-                bytes(self.partner_order_id.trader_id), int(self.partner_order_id.order_number),
-                self.assets.first.amount, str(self.assets.first.asset_id), self.transferred_assets.first.amount,
-                self.assets.second.amount, str(self.assets.second.asset_id),
-                self.transferred_assets.second.amount, int(self.timestamp),
+        order_id = self._order_id
+        partner_order_id = self._partner_order_id
+        assets = self._assets
+        transferred_assets = self._transferred_assets
+        return (order_id.trader_id.trader_id, self._transaction_id.transaction_id,
+                int(order_id.order_number),
+                partner_order_id.trader_id.trader_id, int(partner_order_id.order_number),
+                assets.first.amount, str(assets.first.asset_id), transferred_assets.first.amount,
+                assets.second.amount, str(assets.second.asset_id),
+                transferred_assets.second.amount, self._timestamp,
                 str(self.incoming_address), str(self.outgoing_address),
                 str(self.partner_incoming_address), str(self.partner_outgoing_address))
 
@@ -202,7 +225,7 @@ class Transaction(object):
         """
         :rtype: Timestamp
         """
-        return self._timestamp
+        return Timestamp(self._timestamp)
 
     @property
     def status(self):
@@ -216,12 +239,15 @@ class Transaction(object):
         """
         Add a completed payment to this transaction and update its state.
         """
-        self._logger.debug("Adding transferred assets %s to transaction %s",
-                           payment.transferred_assets, self.transaction_id.as_hex())
-        if payment.transferred_assets.asset_id == self.transferred_assets.first.asset_id:
-            self.transferred_assets.first += payment.transferred_assets
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Adding transferred assets %s to transaction %s",
+                         payment.transferred_assets, self.transaction_id.as_hex())
+        transferred_assets = self._transferred_assets
+        payment_assets = payment.transferred_assets
+        if payment_assets.asset_id == transferred_assets.first.asset_id:
+            transferred_assets.first += payment_assets
         else:
-            self.transferred_assets.second += payment.transferred_assets
+            transferred_assets.second += payment_assets
         self._payments.append(payment)
 
     def next_payment(self, order_is_ask, transfers_per_trade):
@@ -247,24 +273,34 @@ class Transaction(object):
             if self.transferred_assets.second + assets_to_transfer < self.assets.second:
                 assets_to_transfer += (self.assets.second - self.transferred_assets.second - assets_to_transfer)
 
-        self._logger.debug("Returning %s for the next payment", assets_to_transfer)
+        logger.debug("Returning %s for the next payment", assets_to_transfer)
         return assets_to_transfer
 
     def is_payment_complete(self):
-        return self.transferred_assets.first >= self.assets.first and \
-               self.transferred_assets.second >= self.assets.second
+        # The transferred assets always have the same asset ids as the traded assets, so comparing the amounts is
+        # enough and skips the asset id checks of the AssetAmount comparison operators
+        transferred_assets = self._transferred_assets
+        assets = self._assets
+        return transferred_assets.first.amount >= assets.first.amount and \
+            transferred_assets.second.amount >= assets.second.amount
 
     def to_block_dictionary(self):
         """
         Return a dictionary with a representation of this transaction (to add to a tx_done block).
         """
-        return {
-            "trader_id": self.order_id.trader_id.as_hex(),
-            "order_number": int(self.order_id.order_number),
-            "partner_trader_id": self.partner_order_id.trader_id.as_hex(),
-            "partner_order_number": int(self.partner_order_id.order_number),
-            "transaction_id": self.transaction_id.as_hex(),
-            "assets": self.assets.to_dictionary(),
-            "transferred": self.transferred_assets.to_dictionary(),
-            "timestamp": int(self.timestamp),
-        }
+        if self._block_dictionary is None:
+            self._block_dictionary = {
+                "trader_id": self.order_id.trader_id.as_hex(),
+                "order_number": int(self.order_id.order_number),
+                "partner_trader_id": self.partner_order_id.trader_id.as_hex(),
+                "partner_order_number": int(self.partner_order_id.order_number),
+                "transaction_id": self.transaction_id.as_hex(),
+                "assets": self.assets.to_dictionary(),
+                "transferred": None,
+                "timestamp": self._timestamp,
+            }
+
+        # Only the transferred assets change over the lifetime of a transaction
+        block_dictionary = self._block_dictionary.copy()
+        block_dictionary["transferred"] = self.transferred_assets.to_dictionary()
+        return block_dictionary
@@ -2,14 +2,14 @@
 class WalletAddress(object):
     """Used for having a validated instance of a wallet address that we can easily check if it still valid."""
 
+    __slots__ = ('_wallet_address',)
+
     def __init__(self, wallet_address):
         """
         :param wallet_address: String representation of a wallet address
         :type wallet_address: str or unicode
         :raises ValueError: Thrown when one of the arguments are invalid
         """
-        super(WalletAddress, self).__init__()
-
         if not isinstance(wallet_address, str):
             raise ValueError("Wallet address must be a string, found %s instead" % type(wallet_address))
 
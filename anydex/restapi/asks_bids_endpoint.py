@@ -1,10 +1,11 @@
 from aiohttp import web
 
-from ipv8.REST.base_endpoint import HTTP_BAD_REQUEST, Response
+from ipv8.REST.base_endpoint import HTTP_BAD_REQUEST
 
 from anydex.core.assetamount import AssetAmount
 from anydex.core.assetpair import AssetPair
 from anydex.restapi.base_market_endpoint import BaseMarketEndpoint
+from anydex.restapi.response import Response, dumps, loads
 
 
 class BaseAsksBidsEndpoint(BaseMarketEndpoint):
@@ -12,6 +13,24 @@ class BaseAsksBidsEndpoint(BaseMarketEndpoint):
     This class acts as the base class for the asks/bids endpoint.
     """
 
+    @staticmethod
+    async def stream_side(request, name, side):
+        """
+        Stream the ticks in a side of the order book as a JSON object, one market at a time. This way, the response for
+        a large order book is never built in memory as a whole, and the first bytes are sent before the last market
+        has been serialized.
+        """
+        response = web.StreamResponse()
+        response.content_type = 'application/json'
+        await response.prepare(request)
+        await response.write(b'{"' + name + b'": [')
+        separator = b''
+        for market in side.iter_list_representation():
+            await response.write(separator + dumps(market))
+            separator = b', '
+        await response.write(b']}')
+        return response
+
     @staticmethod
     def create_ask_bid_from_params(parameters):
         """
@@ -78,7 +97,7 @@ class AsksEndpoint(BaseAsksBidsEndpoint):
                     }, ...]
                 }
         """
-        return Response({"asks": self.get_market_community().order_book.asks.get_list_representation()})
+        return await self.stream_side(request, b'asks', self.get_market_community().order_book.asks)
 
     async def create_ask(self, request):
         """
@@ -114,7 +133,7 @@ class AsksEndpoint(BaseAsksBidsEndpoint):
                     "trader_id": "9695c9e15201d08586e4230f4a8524799ebcb2d7"
                 }
         """
-        parameters = await request.json()
+        parameters = await request.json(loads=loads)
 
         if 'first_asset_amount' not in parameters or 'second_asset_amount' not in parameters:
             return Response({"error": "asset amount parameter missing"}, status=HTTP_BAD_REQUEST)
@@ -180,7 +199,7 @@ class BidsEndpoint(BaseAsksBidsEndpoint):
                     }, ...]
                 }
         """
-        return Response({"bids": self.get_market_community().order_book.bids.get_list_representation()})
+        return await self.stream_side(request, b'bids', self.get_market_community().order_book.bids)
 
     async def create_bid(self, request):
         """
@@ -216,7 +235,7 @@ class BidsEndpoint(BaseAsksBidsEndpoint):
                     "trader_id": "9695c9e15201d08586e4230f4a8524799ebcb2d7"
                 }
         """
-        parameters = await request.json()
+        parameters = await request.json(loads=loads)
 
         if 'first_asset_amount' not in parameters or 'second_asset_amount' not in parameters:
             return Response({"error": "asset amount parameter missing"}, status=HTTP_BAD_REQUEST)
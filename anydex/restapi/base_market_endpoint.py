@@ -8,9 +8,28 @@ class BaseMarketEndpoint(BaseEndpoint):
     This class can be used as a base class for all Market community endpoints.
     """
 
+    def __init__(self, middlewares=()):
+        super(BaseMarketEndpoint, self).__init__(middlewares)
+        self._market_community = None  # The market community of the session, looked up on first use
+
+    def initialize(self, session):
+        super(BaseMarketEndpoint, self).initialize(session)
+        self.invalidate_market_community()
+
     def get_market_community(self):
+        market_community = self._market_community
+        if market_community is not None:
+            return market_community
+
         for overlay in self.session.overlays:
             if isinstance(overlay, MarketCommunity):
+                self._market_community = overlay
                 return overlay
 
         raise RuntimeError("Market community not found!")
+
+    def invalidate_market_community(self):
+        """
+        Forget the market community found earlier, for instance when the overlays of the session have been reloaded.
+        """
+        self._market_community = None
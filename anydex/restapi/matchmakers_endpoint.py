@@ -1,8 +1,7 @@
 from aiohttp import web
 
-from ipv8.REST.base_endpoint import Response
-
 from anydex.restapi.base_market_endpoint import BaseMarketEndpoint
+from anydex.restapi.response import Response
 
 
 class MatchmakersEndpoint(BaseMarketEndpoint):
@@ -1,10 +1,11 @@
 from aiohttp import web
 
-from ipv8.REST.base_endpoint import HTTP_BAD_REQUEST, HTTP_NOT_FOUND, Response
+from ipv8.REST.base_endpoint import HTTP_BAD_REQUEST, HTTP_NOT_FOUND
 
 from anydex.core.message import TraderId
 from anydex.core.order import OrderId, OrderNumber
 from anydex.restapi.base_market_endpoint import BaseMarketEndpoint
+from anydex.restapi.response import Response
 
 
 class OrdersEndpoint(BaseMarketEndpoint):
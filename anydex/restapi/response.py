@@ -0,0 +1,54 @@
+import json
+
+from ipv8.REST.base_endpoint import Response as IPv8Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data):
+    """
+    Serialize data to JSON bytes. This uses orjson when it is installed, since it is much faster than the json module
+    for the large lists returned by the order book endpoints.
+
+    :param data: The data to serialize
+    :rtype: bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson does not support everything the json module does, for instance integers above 64 bits
+            pass
+    return json.dumps(data).encode('utf-8')
+
+
+def loads(data):
+    """
+    Deserialize a JSON document, using orjson when it is installed.
+
+    :param data: The JSON document
+    :type data: str or bytes
+    :raises json.JSONDecodeError: Thrown when the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the json module decide, since it also accepts documents with integers above 64 bits
+            pass
+    return json.loads(data)
+
+
+class Response(IPv8Response):
+    """
+    Response that serializes dictionaries and lists with the fastest JSON encoder available.
+    """
+
+    def __init__(self, body=None, headers=None, content_type=None, status=200, **kwargs):
+        if isinstance(body, (dict, list)):
+            body = dumps(body)
+            content_type = 'application/json'
+        super(Response, self).__init__(body=body, headers=headers, content_type=content_type, status=status, **kwargs)
@@ -66,3 +66,12 @@ def test_str(asset_amounts):
     Test the string representation of a Price object
     """
     assert str(asset_amounts[0]) == "2 BTC"
+
+
+def test_get():
+    """
+    Test whether equal asset amounts are shared
+    """
+    asset_amount = AssetAmount.get(0, 'BTC')
+    assert AssetAmount.get(0, 'BTC') is asset_amount
+    assert AssetAmount.get(0, 'MC') is not asset_amount
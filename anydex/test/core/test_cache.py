@@ -0,0 +1,99 @@
+from asyncio import sleep
+
+from ipv8.test.base import TestBase
+
+from anydex.core.assetamount import AssetAmount
+from anydex.core.assetpair import AssetPair
+from anydex.core.cache import MarketRequestCache, MatchCache, ProposedTradeRequestCache
+from anydex.core.message import TraderId
+from anydex.core.order import OrderId, OrderNumber
+from anydex.test.util import MockObject, timeout
+
+
+class ShortMatchCache(MatchCache):
+
+    @property
+    def timeout_delay(self):
+        return 0.1
+
+
+class ShortProposedTradeRequestCache(ProposedTradeRequestCache):
+
+    @property
+    def timeout_delay(self):
+        return 0.1
+
+
+class TestMarketRequestCache(TestBase):
+    """
+    This class contains tests for the indices of the MarketRequestCache.
+    """
+
+    def setUp(self):
+        super(TestMarketRequestCache, self).setUp()
+        self.request_cache = MarketRequestCache()
+
+        self.order = MockObject()
+        self.order.order_id = OrderId(TraderId(b'0' * 20), OrderNumber(1))
+        self.order.is_ask = lambda: True
+        self.order.release_quantity_for_tick = lambda *_: None
+
+        self.community = MockObject()
+        self.community.request_cache = self.request_cache
+        self.community.order_manager = MockObject()
+        self.community.order_manager.order_repository = MockObject()
+        self.community.order_manager.order_repository.find_by_id = lambda _: self.order
+        self.community.order_manager.order_repository.update = lambda _: None
+        self.community.get_match_cache = lambda _: None
+
+    async def tearDown(self):
+        await self.request_cache.shutdown()
+        await super(TestMarketRequestCache, self).tearDown()
+
+    def get_proposed_trade(self, proposal_id):
+        proposed_trade = MockObject()
+        proposed_trade.proposal_id = proposal_id
+        proposed_trade.order_id = self.order.order_id
+        proposed_trade.recipient_order_id = OrderId(TraderId(b'1' * 20), OrderNumber(1))
+        proposed_trade.assets = AssetPair(AssetAmount(10, 'BTC'), AssetAmount(10, 'MB'))
+        return proposed_trade
+
+    def test_add_pop_match_cache(self):
+        """
+        Test whether a match cache is indexed when added and unindexed when popped
+        """
+        cache = self.request_cache.add(MatchCache(self.community, self.order))
+        self.assertEqual(self.request_cache.match_caches, {1: cache})
+
+        self.request_cache.pop("match", 1)
+        self.assertFalse(self.request_cache.match_caches)
+
+    def test_add_pop_proposed_trade_cache(self):
+        """
+        Test whether proposed trade caches are indexed when added and unindexed when popped
+        """
+        cache1 = self.request_cache.add(ProposedTradeRequestCache(self.community, self.get_proposed_trade(1)))
+        cache2 = self.request_cache.add(ProposedTradeRequestCache(self.community, self.get_proposed_trade(2)))
+        key = (self.order.order_id, OrderId(TraderId(b'1' * 20), OrderNumber(1)))
+        self.assertEqual(self.request_cache.proposed_trade_caches, {key: {1: cache1, 2: cache2}})
+
+        self.request_cache.pop("proposed-trade", 1)
+        self.assertEqual(self.request_cache.proposed_trade_caches, {key: {2: cache2}})
+
+        self.request_cache.pop("proposed-trade", 2)
+        self.assertFalse(self.request_cache.proposed_trade_caches)
+
+    @timeout(1)
+    async def test_timeout(self):
+        """
+        Test whether match caches and proposed trade caches are unindexed when they time out
+        """
+        self.request_cache.add(ShortMatchCache(self.community, self.order))
+        self.request_cache.add(ShortProposedTradeRequestCache(self.community, self.get_proposed_trade(1)))
+
+        await sleep(0.2)
+
+        self.assertFalse(self.request_cache.has("match", 1))
+        self.assertFalse(self.request_cache.has("proposed-trade", 1))
+        self.assertFalse(self.request_cache.match_caches)
+        self.assertFalse(self.request_cache.proposed_trade_caches)
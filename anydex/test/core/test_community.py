@@ -2,6 +2,7 @@ import os
 from asyncio import Future, sleep
 
 from ipv8.dht import DHTError
+from ipv8.messaging.payload_headers import BinMemberAuthenticationPayload
 from ipv8.test.base import TestBase
 from ipv8.test.mocking.ipv8 import MockIPv8
 
@@ -12,13 +13,17 @@ from anydex.core.assetpair import AssetPair
 from anydex.core.block import MarketBlock
 from anydex.core.clearing_policy import SingleTradeClearingPolicy
 from anydex.core.community import MarketCommunity
+from anydex.core.defs import MSG_PING
 from anydex.core.message import TraderId
 from anydex.core.order import Order, OrderId, OrderNumber
+from anydex.core.payload import PingPongPayload, TradePayload
 from anydex.core.tick import Ask, Bid
 from anydex.core.timeout import Timeout
 from anydex.core.timestamp import Timestamp
+from anydex.core.trade import Trade
 from anydex.core.transaction import Transaction, TransactionId
 from anydex.test.util import MockObject, timeout
+from anydex.trustchain.block import ValidationResult
 from anydex.trustchain.community import TrustChainCommunity
 from anydex.wallet.dummy_wallet import DummyWallet1, DummyWallet2
 from anydex.wallet.tc_wallet import TrustchainWallet
@@ -648,6 +653,16 @@ class TestMarketCommunityTwoNodes(TestMarketCommunityBase):
         """
         await self.nodes[0].overlay.ping_peer(self.nodes[1].overlay.my_peer)
 
+    def test_ez_pack_auth(self):
+        """
+        Test whether packing with the pre-serialized authentication payload equals packing with _ez_pack
+        """
+        overlay = self.nodes[0].overlay
+        payload = PingPongPayload(TraderId(overlay.mid), Timestamp.now(), 42)
+        auth = BinMemberAuthenticationPayload(overlay.my_peer.public_key.key_to_bin())
+        self.assertEqual(overlay._ez_pack(overlay._prefix, MSG_PING, [auth, payload], False),
+                         overlay._ez_pack_auth(MSG_PING, [payload], False))
+
 
 class TestMarketCommunityFiveNodes(TestMarketCommunityBase):
     __testing__ = True
@@ -851,6 +866,229 @@ class TestMarketCommunitySingle(TestMarketCommunityBase):
         self.assertEqual(len(self.nodes[0].overlay.order_book.asks), 0)
         self.assertEqual(len(self.nodes[0].overlay.order_book.bids), 0)
 
+    async def test_open_own_orders_create(self):
+        """
+        Test whether created asks and bids are tracked as open orders of this node
+        """
+        overlay = self.nodes[0].overlay
+        ask = await overlay.create_ask(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        bid = await overlay.create_bid(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        self.assertEqual(overlay._open_own_orders, {ask.order_id, bid.order_id})
+
+    async def test_open_own_orders_cancel(self):
+        """
+        Test whether a cancelled order is no longer tracked as open order
+        """
+        overlay = self.nodes[0].overlay
+        ask = await overlay.create_ask(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        await overlay.cancel_order(ask.order_id, broadcast=False)
+        self.assertNotIn(ask.order_id, overlay._open_own_orders)
+
+    async def test_open_own_orders_completed(self):
+        """
+        Test whether a completed order is no longer tracked as open order
+        """
+        overlay = self.nodes[0].overlay
+        bid = await overlay.create_bid(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        overlay.on_order_completed(bid.order_id)
+        self.assertNotIn(bid.order_id, overlay._open_own_orders)
+
+    async def test_open_own_orders_expired(self):
+        """
+        Test whether an open order with an expired tick is dropped when a new tick comes in
+        """
+        overlay = self.nodes[0].overlay
+        ask = await overlay.create_ask(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        overlay.order_book.get_tick(ask.order_id).is_valid = lambda _: False
+
+        matched_ticks = []
+        overlay.match = lambda tick: matched_ticks.append(tick)
+        other_ask = Ask(OrderId(TraderId(b'1' * 20), OrderNumber(1)),
+                        AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), Timeout(3600), Timestamp.now())
+        await overlay.on_tick(other_ask)
+
+        self.assertNotIn(ask.order_id, overlay._open_own_orders)
+        self.assertEqual(matched_ticks, [other_ask])
+
+    @timeout(3)
+    async def test_open_own_orders_timed_out(self):
+        """
+        Test whether an open order is dropped when a new tick comes in after the order book timed out its tick
+        """
+        overlay = self.nodes[0].overlay
+        ask = await overlay.create_ask(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 1)
+
+        await sleep(1.2)
+        self.assertFalse(overlay.order_book.tick_exists(ask.order_id))
+
+        other_ask = Ask(OrderId(TraderId(b'1' * 20), OrderNumber(1)),
+                        AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), Timeout(3600), Timestamp.now())
+        await overlay.on_tick(other_ask)
+
+        self.assertNotIn(ask.order_id, overlay._open_own_orders)
+
+    async def test_open_own_orders_completed_tick(self):
+        """
+        Test whether an open order is dropped when a new tick comes in after its tick was removed on completion
+        """
+        overlay = self.nodes[0].overlay
+        ask = await overlay.create_ask(AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), 3600)
+        ask._traded_quantity = 1  # Fulfill this order
+        ask._received_quantity = 2
+        overlay.order_book.remove_tick(ask.order_id)
+
+        other_ask = Ask(OrderId(TraderId(b'1' * 20), OrderNumber(1)),
+                        AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(2, 'DUM2')), Timeout(3600), Timestamp.now())
+        await overlay.on_tick(other_ask)
+
+        self.assertNotIn(ask.order_id, overlay._open_own_orders)
+
+    async def test_proposed_trade_unknown_address(self):
+        """
+        Test whether the reserved quantity is released when we cannot accept a proposed trade of an unknown peer
+        """
+        overlay = self.nodes[0].overlay
+        assets = AssetPair(AssetAmount(1, 'DUM1'), AssetAmount(1, 'DUM2'))
+        bid = await overlay.create_bid(assets, 3600)
+        proposed_trade = Trade.propose(TraderId(b'1' * 20), OrderId(TraderId(b'1' * 20), OrderNumber(1)),
+                                       bid.order_id, assets, Timestamp.now())
+
+        overlay.update_ip = lambda *_: None  # The address of the proposing peer stays unknown
+        peer = MockObject()
+        peer.address = ("1.2.3.4", 1234)
+        await overlay.received_proposed_trade.__wrapped__(overlay, peer, TradePayload(*proposed_trade.to_network()))
+
+        self.assertEqual(bid.reserved_quantity, 0)
+
+    def mock_matched_tx_complete(self, validation_results):
+        """
+        Let the matchmaker process transaction-completed messages without unpacking or validating real blocks.
+        Each call of validate_persist_block pops the next result from validation_results.
+        Returns the list with block pairs that the matchmaker broadcasts.
+        """
+        overlay = self.nodes[0].overlay
+        tx_done = TestMarketCommunitySingle.get_tx_done_block(10, 3, 3, 3, 3)
+        payload = MockObject()
+        payload.type1 = b'tx_done'
+        block_class = MockObject()
+        block_class.from_pair_payload = lambda *_: (tx_done, tx_done)
+        overlay._ez_unpack_noauth = lambda *_: (None, payload)
+        overlay.trustchain.get_block_class = lambda _: block_class
+        overlay.trustchain.validate_persist_block = lambda _: (validation_results.pop(0), [])
+        overlay.order_book.update_ticks = lambda *_: None
+        overlay.match_order_ids = lambda _: None
+        broadcasts = []
+        overlay.broadcast_block_pair = lambda block1, block2: broadcasts.append((block1, block2))
+        return broadcasts
+
+    def test_matched_tx_complete_duplicate(self):
+        """
+        Test whether the matchmaker processes a transaction-completed message only once
+        """
+        broadcasts = self.mock_matched_tx_complete([ValidationResult.valid] * 2)
+        data = self.nodes[0].overlay._prefix + b'\x00' + b'\x00' * 8 + b'pair'
+
+        self.nodes[0].overlay.received_matched_tx_complete(None, data)
+        self.nodes[0].overlay.received_matched_tx_complete(None, data)
+        self.assertEqual(len(broadcasts), 1)
+
+    def test_matched_tx_complete_retry(self):
+        """
+        Test whether the matchmaker processes a copy of a transaction-completed message when the first one failed
+        """
+        validation_results = [ValidationResult.invalid, ValidationResult.valid,
+                              ValidationResult.valid, ValidationResult.valid]
+        broadcasts = self.mock_matched_tx_complete(validation_results)
+        data = self.nodes[0].overlay._prefix + b'\x00' + b'\x00' * 8 + b'pair'
+
+        self.nodes[0].overlay.received_matched_tx_complete(None, data)
+        self.assertFalse(self.nodes[0].overlay.received_match_done_hashes)
+        self.nodes[0].overlay.received_matched_tx_complete(None, data)
+        self.assertEqual(len(self.nodes[0].overlay.received_match_done_hashes), 1)
+        self.nodes[0].overlay.received_matched_tx_complete(None, data)
+        self.assertFalse(validation_results)
+        self.assertEqual(len(broadcasts), 2)
+
+    def test_sent_matches_eviction(self):
+        """
+        Test whether the oldest sent match is forgotten when we exceed max_sent_matches
+        """
+        overlay = self.nodes[0].overlay
+        overlay.settings.max_sent_matches = 2
+        recipient_order_id = OrderId(TraderId(b'1' * 20), OrderNumber(1))
+        order_ids = [OrderId(TraderId(b'0' * 20), OrderNumber(order_number)) for order_number in range(1, 4)]
+
+        for order_id in order_ids:
+            self.assertFalse(overlay.has_sent_match(recipient_order_id, order_id))
+            overlay.add_sent_match(recipient_order_id, order_id)
+
+        self.assertEqual(len(overlay.sent_matches), 2)
+        self.assertFalse(overlay.has_sent_match(recipient_order_id, order_ids[0]))
+        self.assertTrue(overlay.has_sent_match(recipient_order_id, order_ids[1]))
+        self.assertTrue(overlay.has_sent_match(recipient_order_id, order_ids[2]))
+
+    def test_sent_matches_resend_after_eviction(self):
+        """
+        Test whether we can send a match again after it has been evicted, and whether the bitmap is rebuilt
+        """
+        overlay = self.nodes[0].overlay
+        overlay.settings.max_sent_matches = 2
+        recipient_order_id = OrderId(TraderId(b'1' * 20), OrderNumber(1))
+        order_ids = [OrderId(TraderId(b'0' * 20), OrderNumber(order_number)) for order_number in range(1, 5)]
+
+        for order_id in order_ids:
+            overlay.add_sent_match(recipient_order_id, order_id)
+
+        # The record wrapped around once, so the bitmap only holds the two pairs that are left
+        self.assertEqual(sum(bin(byte).count('1') for byte in overlay._sent_matches_bloom), 2)
+        self.assertFalse(overlay.has_sent_match(recipient_order_id, order_ids[0]))
+
+        overlay.add_sent_match(recipient_order_id, order_ids[0])
+        self.assertTrue(overlay.has_sent_match(recipient_order_id, order_ids[0]))
+        self.assertFalse(overlay.has_sent_match(recipient_order_id, order_ids[2]))
+        self.assertTrue(overlay.has_sent_match(recipient_order_id, order_ids[3]))
+
+    async def test_flush_match_sends(self):
+        """
+        Test whether queued match messages are sent in a single flush, including those queued during the flush
+        """
+        overlay = self.nodes[0].overlay
+        overlay.settings.match_send_interval = 0.4
+        pair = AssetPair(AssetAmount(30, 'BTC'), AssetAmount(30, 'MB'))
+        ticks = [Ask(OrderId(TraderId(b'0' * 20), OrderNumber(order_number)), pair, Timeout(3600), Timestamp.now())
+                 for order_number in range(1, 5)]
+        recipient_order_id = OrderId(TraderId(b'1' * 20), OrderNumber(1))
+
+        sent = []
+
+        async def mock_send_match_payload(_, order_id, __):
+            sent.append(order_id)
+            if len(sent) == 1:
+                overlay.send_match_message(ticks[3], recipient_order_id)
+            await sleep(0.05)
+
+        flushes = []
+        flush_match_sends = overlay.flush_match_sends
+
+        def mock_flush_match_sends():
+            flushes.append(True)
+            return flush_match_sends()
+
+        overlay.send_match_payload = mock_send_match_payload
+        overlay.flush_match_sends = mock_flush_match_sends
+
+        for tick in ticks[:3]:
+            overlay.send_match_message(tick, recipient_order_id)
+
+        await sleep(0.1)
+        self.assertFalse(sent)
+
+        await sleep(0.3)
+        self.assertEqual(sent, [tick.order_id for tick in ticks])
+        self.assertEqual(len(flushes), 1)
+        self.assertFalse(overlay._pending_match_sends)
+        self.assertFalse(overlay.is_pending_task_active("flush_match_sends"))
+
     async def test_order_invalid_timeout(self):
         """
         Test whether we cannot create an order with an invalid timeout
@@ -72,3 +72,19 @@ def test_priority(bid_order, queue):
     assert item1[1] == Price(1, 3, 'DUM1', 'DUM2')
     assert item2[1] == Price(1, 2, 'DUM1', 'DUM2')
     assert item3[1] == Price(1, 1, 'DUM1', 'DUM2')
+
+
+def test_remove_order(queue):
+    """
+    Test removing all items of a specific order from the queue
+    """
+    order_id1 = OrderId(TraderId(b'1' * 20), OrderNumber(1))
+    order_id2 = OrderId(TraderId(b'2' * 20), OrderNumber(1))
+    queue.insert(0, Price(1, 1, 'DUM1', 'DUM2'), order_id1, 1)
+    queue.insert(1, Price(1, 2, 'DUM1', 'DUM2'), order_id2, 1)
+    queue.insert(2, Price(1, 3, 'DUM1', 'DUM2'), order_id1, 1)
+
+    queue.remove_order(order_id1)
+    assert not queue.contains_order(order_id1)
+    assert queue.delete()[2] == order_id2
+    assert queue.is_empty()
@@ -0,0 +1,51 @@
+from ipv8.messaging.serialization import default_serializer
+
+import pytest
+
+from anydex.core.assetamount import AssetAmount
+from anydex.core.assetpair import AssetPair
+from anydex.core.bloomfilter import BloomFilter
+from anydex.core.message import TraderId
+from anydex.core.order import OrderId, OrderNumber
+from anydex.core.payload import DeclineMatchPayload, DeclineTradePayload, InfoPayload, MatchPayload, \
+    OrderStatusResponsePayload, OrderbookSyncPayload, PingPongPayload, TradePayload
+from anydex.core.timeout import Timeout
+from anydex.core.timestamp import Timestamp
+
+
+TRADER_ID = TraderId(b'1' * 20)
+OTHER_TRADER_ID = TraderId(b'2' * 20)
+ASSETS = AssetPair(AssetAmount(30, 'BTC'), AssetAmount(40, 'MB'))
+
+
+@pytest.fixture(params=[
+    lambda: InfoPayload(TRADER_ID, Timestamp(1000), True),
+    lambda: MatchPayload(TRADER_ID, Timestamp(1000), OrderNumber(3), ASSETS, Timeout(3600), 5, OrderNumber(4),
+                         OTHER_TRADER_ID, TRADER_ID),
+    lambda: DeclineMatchPayload(TRADER_ID, Timestamp(1000), OrderNumber(3), OrderId(OTHER_TRADER_ID, OrderNumber(4)),
+                                2),
+    lambda: TradePayload(TRADER_ID, Timestamp(1000), OrderNumber(3), OrderId(OTHER_TRADER_ID, OrderNumber(4)), 12,
+                         ASSETS),
+    lambda: DeclineTradePayload(TRADER_ID, Timestamp(1000), OrderNumber(3), OrderId(OTHER_TRADER_ID, OrderNumber(4)),
+                                12, 1),
+    lambda: OrderStatusResponsePayload(TRADER_ID, Timestamp(1000), OrderNumber(3), ASSETS, Timeout(3600), 5, 8),
+    lambda: OrderbookSyncPayload(TRADER_ID, Timestamp(1000), BloomFilter(0.1, 100, prefix=b' ')),
+    lambda: PingPongPayload(TRADER_ID, Timestamp(1000), 3),
+])
+def payload(request):
+    return request.param()
+
+
+def test_to_bytes(payload):
+    """
+    Test whether serializing a payload directly gives the same bytes as the ipv8 serializer
+    """
+    assert payload.to_bytes() == default_serializer.pack_serializable(payload)
+
+
+def test_to_bytes_round_trip(payload):
+    """
+    Test whether the directly serialized bytes can be unpacked again
+    """
+    unpacked = default_serializer.unpack_serializable(payload.__class__, payload.to_bytes())[0]
+    assert unpacked.to_bytes() == payload.to_bytes()
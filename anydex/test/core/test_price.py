@@ -34,3 +34,27 @@ class TestPrice(unittest.TestCase):
         """
         self.assertTrue(self.price1 < self.price2)
         self.assertFalse(self.price1 > self.price2)
+
+    def test_cmp_exact(self):
+        """
+        Test whether prices that are equal as floats are still compared exactly
+        """
+        price = Price(10 ** 17 + 1, 10 ** 17, 'MB', 'BTC')
+        self.assertTrue(price > Price(1, 1, 'MB', 'BTC'))
+        self.assertFalse(price <= Price(1, 1, 'MB', 'BTC'))
+
+    def test_frac(self):
+        """
+        Test whether the fraction of a Price object is reduced and keeps its sign on the numerator
+        """
+        self.assertEqual(self.price1.frac, 2)
+        self.assertEqual(Price(3, -6, 'MB', 'BTC').frac.numerator, -1)
+        self.assertRaises(ZeroDivisionError, Price, 1, 0, 'MB', 'BTC')
+
+    def test_cmp_other_market(self):
+        """
+        Test whether prices in different markets cannot be compared
+        """
+        price = Price(4, 2, 'BTC', 'MB')
+        self.assertNotEqual(self.price1, price)
+        self.assertRaises(TypeError, lambda: self.price1 < price)
@@ -70,6 +70,12 @@ class PriceLevelListTestSuite(unittest.TestCase):
         self.price_level_list.remove(self.price4)
         self.assertEqual(self.price3, self.price_level_list.max_key())
 
+    def test_remove_relinks(self):
+        # Test whether the neighbours of a removed price level are linked to each other
+        self.price_level_list.remove(self.price2)
+        self.assertEqual(self.price_level3, self.price_level_list.succ_item(self.price))
+        self.assertEqual(self.price_level, self.price_level_list.prev_item(self.price3))
+
     def test_remove_empty(self):
         # Test for remove when element not exists
         self.price_level_list.remove(self.price4)
@@ -100,3 +106,8 @@ class PriceLevelListTestSuite(unittest.TestCase):
     def test_items_reverse_empty(self):
         # Test for items when empty with reverse attribute
         self.assertEqual([], self.price_level_list2.items(reverse=True))
+
+    def test_items_iter(self):
+        # Test for iterating over the items in both directions
+        self.assertEqual(self.price_level_list.items(), list(self.price_level_list.items_iter()))
+        self.assertEqual(self.price_level_list.items(reverse=True), list(self.price_level_list.items_iter(reverse=True)))
@@ -1,6 +1,7 @@
 import unittest
 from binascii import hexlify
 
+from anydex.core import MAX_ORDER_TIMEOUT
 from anydex.core.assetamount import AssetAmount
 from anydex.core.assetpair import AssetPair
 from anydex.core.message import TraderId
@@ -34,6 +35,24 @@ class TickTestSuite(unittest.TestCase):
         self.assertTrue(self.tick.is_ask())
         self.assertFalse(self.tick2.is_ask())
 
+    def test_is_valid(self):
+        # Test for is valid
+        assets = AssetPair(AssetAmount(30, 'BTC'), AssetAmount(30, 'MB'))
+        order_id = OrderId(TraderId(b'0' * 20), OrderNumber(3))
+        self.assertFalse(self.tick.is_valid())
+        self.assertTrue(Tick(order_id, assets, Timeout(30), self.timestamp_now, True).is_valid())
+        self.assertFalse(Tick(order_id, assets, Timeout(MAX_ORDER_TIMEOUT + 1), self.timestamp_now, True).is_valid())
+        future_timestamp = Timestamp(int(self.timestamp_now) + 60 * 1000)
+        self.assertFalse(Tick(order_id, assets, Timeout(30), future_timestamp, True).is_valid())
+
+    def test_is_valid_now(self):
+        # Test for is valid at a given time
+        assets = AssetPair(AssetAmount(30, 'BTC'), AssetAmount(30, 'MB'))
+        order_id = OrderId(TraderId(b'0' * 20), OrderNumber(3))
+        tick = Tick(order_id, assets, Timeout(30), Timestamp(1000 * 1000), True)
+        self.assertTrue(tick.is_valid(1000 * 1000))
+        self.assertFalse(tick.is_valid(1030 * 1000))
+
     def test_to_network(self):
         # Test for to network
         self.assertEqual((TraderId(b'0' * 20), self.tick.timestamp, OrderNumber(1),
@@ -78,3 +97,11 @@ class TickTestSuite(unittest.TestCase):
             "traded": 0,
             "block_hash": hexlify(b'0' * 32).decode('utf-8')
         })
+
+    def test_to_dictionary_traded(self):
+        """
+        Test whether the dictionary of a tick reflects a change in the traded quantity
+        """
+        self.assertEqual(self.tick.to_dictionary()["traded"], 0)
+        self.tick.traded = 10
+        self.assertEqual(self.tick.to_dictionary()["traded"], 10)
@@ -1,3 +1,4 @@
+import operator
 import time
 import unittest
 
@@ -24,6 +25,12 @@ class TimeoutTestSuite(unittest.TestCase):
         # Test for timed out
         self.assertTrue(self.timeout1.is_timed_out(Timestamp(int(time.time() * 1000) - 3700 * 1000)))
         self.assertFalse(self.timeout2.is_timed_out(Timestamp(int(time.time() * 1000))))
+        self.assertTrue(self.timeout2.is_timed_out(Timestamp(0), int(self.timeout2) * 1000))
+
+    def test_conversion(self):
+        # Test for conversions
+        self.assertEqual(3600, int(self.timeout1))
+        self.assertEqual(3600, operator.index(self.timeout1))
 
     def test_hash(self):
         # Test for hashes
@@ -1,3 +1,4 @@
+import operator
 import time
 import unittest
 
@@ -27,6 +28,7 @@ class TimestampTestSuite(unittest.TestCase):
     def test_conversion(self):
         # Test for conversions
         self.assertEqual(1462224447000, int(self.timestamp))
+        self.assertEqual(1462224447000, operator.index(self.timestamp))
 
         # We cannot check the exact timestamp since this is specific to the configured time zone
         self.assertTrue(str(self.timestamp))
@@ -33,6 +33,21 @@ class TransactionTestSuite(unittest.TestCase):
                                 AssetAmount(100, 'BTC'), WalletAddress('a'), WalletAddress('b'),
                                 PaymentId('aaa'), Timestamp(4))
 
+    def test_transaction_id_equality(self):
+        """
+        Test the equality of transaction ids
+        """
+        self.assertEqual(self.transaction_id, TransactionId(bytearray(b'a' * 32)))
+        self.assertNotEqual(self.transaction_id, TransactionId(b'b' * 32))
+        self.assertNotEqual(self.transaction_id, b'a' * 32)
+
+    def test_transaction_id_invalid(self):
+        """
+        Test whether a transaction id cannot be created from something other than 32 bytes
+        """
+        self.assertRaises(ValueError, TransactionId, 32)
+        self.assertRaises(ValueError, TransactionId, b'a' * 31)
+
     def test_add_payment(self):
         """
         Test the addition of a payment to a transaction
@@ -110,6 +125,14 @@ class TransactionTestSuite(unittest.TestCase):
             'timestamp': 0,
         })
 
+    def test_to_dictionary_transferred(self):
+        """
+        Test whether the dictionary of a transaction reflects the payments made after an earlier call
+        """
+        self.assertEqual(self.transaction.to_block_dictionary()['transferred']['second']['amount'], 0)
+        self.transaction.add_payment(self.payment)
+        self.assertEqual(self.transaction.to_block_dictionary()['transferred']['second']['amount'], 100)
+
     def test_status(self):
         """
         Test the status of a transaction